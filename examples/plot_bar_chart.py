@@ -4,6 +4,7 @@ Bar chart
 An example of a bar chart.
 """
 
+import numpy as np
 import matplotlib.pyplot as plt
 import niceplots
 
@@ -22,3 +23,11 @@ nd = 4
 with plt.style.context(niceplots.get_style()):
     fig, axes = niceplots.horiz_bar(labels, times, header, nd=nd, size=[7, 0.65])
     niceplots.save_figs(fig, "bar_chart", ["png", "svg"])
+
+# With many bars, drawing them all on a single axes is much faster than creating a subplot for each one
+manyLabels = [f"Case {i + 1}" for i in range(30)]
+manyTimes = np.linspace(0.1, 3.0, 30) ** 2
+
+with plt.style.context(niceplots.get_style()):
+    fig, ax = niceplots.horiz_bar(manyLabels, manyTimes, ["Case", "Time (sec)"], nd=2, size=[7, 0.3], singleAxes=True)
+    niceplots.save_figs(fig, "bar_chart_single_axes", ["svg"])
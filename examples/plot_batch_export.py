@@ -0,0 +1,56 @@
+"""
+Exporting many figures
+======================
+An example of saving many figures in several formats at once with :func:`niceplots.save_figs_batch`, in parallel or
+one at a time, and of skipping the figures whose inputs haven't changed since they were last saved.
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import matplotlib.pyplot as plt
+import niceplots
+
+
+def plot_wave(frequency):
+    x = np.linspace(0, 2 * np.pi, 200)
+    fig, ax = plt.subplots()
+    ax.plot(x, np.sin(frequency * x), clip_on=False)
+    ax.set_xlabel("$x$")
+    ax.set_ylabel(f"$\\sin({frequency}x)$", rotation="horizontal", ha="right")
+    niceplots.adjust_spines(ax)
+    return fig
+
+
+# Figures saved in parallel are rendered in separate processes, which on some platforms run this script again when they
+# start, so only create and save the figures when the script itself is run
+if __name__ == "__main__":
+    plt.style.use(niceplots.get_style())
+    frequencies = [1, 2, 3]
+
+    # --- Render existing figures in parallel ---
+    figs = {f"batch_wave_{frequency}": plot_wave(frequency) for frequency in frequencies}
+    manifest = niceplots.save_figs_batch(figs, ["svg", "pdf"], parallel=True, max_workers=2)
+    for name, entry in manifest.items():
+        print(f"Saved {', '.join(entry['files'])}")
+
+    # A single figure's formats can also be rendered in parallel
+    fig = plot_wave(4)
+    niceplots.save_figs(fig, "batch_wave_4", ["svg", "pdf"], parallel=True)
+    plt.close(fig)
+
+    # --- Only create the figures whose inputs have changed ---
+    # Figures can be given as functions that create them, which are only called if the figure needs saving. The second
+    # time round, the files saved the first time are up to date, so neither figure is created or saved again.
+    figs = {f"batch_wave_cached_{frequency}": partial(plot_wave, frequency) for frequency in frequencies[:2]}
+    inputs = {f"batch_wave_cached_{frequency}": frequency for frequency in frequencies[:2]}
+    for _ in range(2):
+        manifest = niceplots.save_figs_batch(figs, ["svg"], inputs=inputs)
+        for name, entry in manifest.items():
+            print(f"{name}: created in {entry['createTime']:.3f} s, saved in {sum(entry['timings'].values()):.3f} s")
@@ -2,7 +2,7 @@
 Colored line plotting
 =====================
 An example of the plot_colored_line function, plotting the sine and cosine functions,
-colored by their derivatives
+colored by their derivatives, and of the plot_colored_lines function, plotting many lines at once
 """
 
 # ==============================================================================
@@ -55,3 +55,20 @@ ax.set_xticklabels([0, r"$\frac{\pi}{2}$", r"$\pi$", r"$\frac{3\pi}{2}$", r"$2\p
 ax.set_xlim(0, 2 * np.pi)
 
 niceplots.save_figs(fig, "colored_line_custom_norm", ["png", "svg"])
+
+
+# Plot many lines with a shared colormap range at once, here damped oscillations colored by their amplitude
+lines = []
+for damping in np.linspace(0.1, 1.0, 20):
+    yDamped = np.exp(-damping * x) * np.sin(2 * x)
+    lines.append((x, yDamped, np.abs(yDamped)))
+
+fig, ax = niceplots.plot_colored_lines(
+    lines, cmap="viridis", addColorBar=True, cBarLabel="$|y|$", mergeColors=True, clip_on=False
+)
+niceplots.adjust_spines(ax)
+ax.set_xlabel("$x$")
+ax.set_ylabel("$y$", rotation="horizontal", ha="right")
+ax.set_xlim(0, 2 * np.pi)
+
+niceplots.save_figs(fig, "colored_lines", ["svg"])
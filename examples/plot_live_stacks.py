@@ -0,0 +1,47 @@
+"""
+Live stacked plots
+==================
+An example of using :class:`niceplots.LiveStackedPlots` to plot the history of an optimisation as it runs.
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import matplotlib.pyplot as plt
+import niceplots
+
+plt.style.use(niceplots.get_style())
+
+# Two optimisations of the 2D Rosenbrock function, one with a smaller step size than the other, are plotted as two
+# series on the same plots. The figure is redrawn and re-saved as the iterations come in, but no more than once every
+# draw_interval and save_interval seconds, so plotting doesn't slow the optimisation down.
+live = niceplots.LiveStackedPlots(
+    "Iteration",
+    ["Objective", "$x_1$", "$x_2$"],
+    num_series=2,
+    figsize=(10, 6),
+    filename="live_stacks.svg",
+    save_interval=1.0,
+    draw_interval=0.5,
+    blit=True,
+)
+
+
+def rosenbrock(x):
+    return (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2
+
+
+def rosenbrockGrad(x):
+    return np.array([-2 * (1 - x[0]) - 400 * x[0] * (x[1] - x[0] ** 2), 200 * (x[1] - x[0] ** 2)])
+
+
+for series, stepSize in enumerate([1e-3, 2e-4]):
+    x = np.array([-1.2, 1.0])
+    for iteration in range(2000):
+        live.append(iteration, {"Objective": rosenbrock(x), "$x_1$": x[0], "$x_2$": x[1]}, series=series)
+        x = x - stepSize * rosenbrockGrad(x)
+
+# Redraw with the final data, then save the figure and close it
+live.draw()
+live.close()
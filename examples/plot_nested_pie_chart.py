@@ -1,7 +1,7 @@
 """
 Nested pie chart
 ================
-An example of a nested pie chart.
+An example of a nested pie chart, and of a deeper one with its small slices combined.
 """
 
 import matplotlib.pyplot as plt
@@ -39,3 +39,26 @@ pieObjects["Pizza"]["Cheese"]["text"].set_weight("bold")
 pieObjects["Pizza"]["Cheese"]["text"].set_x(-0.82)
 
 niceplots.save_figs(fig, "nested_pie_chart", ["png", "svg"])
+
+# Subcategories can themselves be split into subcategories, adding another ring to the chart. Small slices can be
+# combined into a single "Other" wedge per category, and slices too thin to fit a label left unlabelled.
+deepData = {
+    "Pie": {
+        "Fruit": {"Apple": 8, "Lime": 5, "Cherry": 0.3, "Plum": 0.2},
+        "Savoury": {"Steak": 6, "Chicken": 4},
+    },
+    "Pizza": {
+        "Cheese": 14,
+        "Veggie": 12,
+        "Anchovy": 0.4,
+        "Pineapple": 0.3,
+    },
+    "Soup": {"Tomato": 3, "Leek": 1.5},
+}
+
+fig, ax = plt.subplots(figsize=(8, 8))
+niceplots.plot_nested_pie(
+    deepData, colors=list(colors.values()), ax=ax, minFraction=0.02, minLabelFraction=0.04, otherLabel="Other"
+)
+
+niceplots.save_figs(fig, "nested_pie_chart_deep", ["svg"])
@@ -0,0 +1,82 @@
+"""
+Reusing optimization problem evaluations
+========================================
+An example of how to avoid evaluating the functions of an optimization problem again every time it's plotted, using
+:class:`niceplots.OptProblem` and the caching, adaptive sampling, and scalar function support of
+:func:`niceplots.plot_opt_prob`. This example plots the 2D Rosenbrock function with a circular inequality constraint.
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import math
+import tempfile
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import matplotlib.pyplot as plt
+import niceplots
+
+plt.style.use(niceplots.get_style())
+
+
+def Rosenbrock(x, y):
+    return (1 - x) ** 2 + 100 * (y - x**2) ** 2
+
+
+def circleCon(x, y):
+    # This constraint uses the math module, so only works with scalar inputs
+    return math.hypot(x - 0.5, y - 0.5) - 0.75
+
+
+# --- Plot the problem twice, only evaluating its functions the first time ---
+# The function values are cached in a directory, so the second plot, in a different style, reuses them. With
+# vectorized="auto", plot_opt_prob works out that the constraint only accepts scalars and calls it one point at a time.
+# Adaptive sampling only evaluates the functions on the full grid around the contour lines and constraint boundary.
+with tempfile.TemporaryDirectory() as cacheDir:
+    for conStyle in ["shaded", "hashed"]:
+        fig, ax = plt.subplots(figsize=(8, 8))
+        ax.set_aspect("equal")
+        niceplots.plot_opt_prob(
+            Rosenbrock,
+            xRange=[-0.5, 1.5],
+            yRange=[-0.5, 1.5],
+            ineqCon=circleCon,
+            nPoints=101,
+            optPoint=[1.0, 1.0],
+            conStyle=conStyle,
+            ax=ax,
+            levels=50,
+            adaptive=True,
+            cacheDir=cacheDir,
+            vectorized="auto",
+        )
+        niceplots.save_figs(fig, f"opt_prob_reuse-{conStyle}", ["svg"])
+
+# --- Some fake optimiser paths, spiralling in to the optimum from a few starting points ---
+iterations = np.linspace(0, 1, 200)
+optPaths = []
+for angle in [0.0, 2.0, 4.0]:
+    offset = 0.4 * np.column_stack([np.cos(angle + 6 * iterations), np.sin(angle + 6 * iterations)])
+    optPaths.append(1.0 + offset * (1 - iterations[:, np.newaxis]) ** 2)
+
+# --- Zoom in on the optimum ---
+# An OptProblem evaluates the functions once and can then be plotted any number of times. Zooming in reuses the values
+# at the points the new grid shares with the old one.
+problem = niceplots.OptProblem(
+    Rosenbrock, xRange=[-0.5, 1.5], yRange=[-0.5, 1.5], ineqCon=circleCon, nPoints=51, vectorized="auto"
+)
+zoomed = problem.zoom(xRange=[0.5, 1.5], yRange=[0.5, 1.5])
+
+# The paths can be plotted along with the problem, or added to an existing plot with plot_opt_path, here colored by
+# iteration so the runs' progress can be compared
+fig, ax = problem.plot(optPoint=[1.0, 1.0], levels=50, optPaths=optPaths)
+ax.set_aspect("equal")
+niceplots.save_figs(fig, "opt_prob_reuse-full", ["svg"])
+
+fig, ax = zoomed.plot(optPoint=[1.0, 1.0], levels=50)
+niceplots.plot_opt_path(optPaths, ax=ax, colorByIteration=True, addColorBar=True)
+ax.set_aspect("equal")
+niceplots.save_figs(fig, "opt_prob_reuse-zoomed", ["svg"])
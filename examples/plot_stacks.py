@@ -53,3 +53,30 @@ f, axarr = niceplots.stacked_plots(
     filename="opt_stacks_more_data.png",
 )
 f.savefig("opt_stacks_more_data.svg")
+
+# Long histories, e.g. from an optimisation with thousands of iterations, can be decimated so that only the points
+# that affect the look of each line are plotted. The data can also be given as a 2D array with one column per plot.
+# Drawing every series on a plot with a single collection is also much faster when there are many series.
+nLong = 20000
+timeLong = np.linspace(0, 250.0, nLong)
+longData = []
+for phase, damp in zip(phases, damping):
+    noise = np.random.standard_normal(nLong)
+    Position = 1.0 + np.sin(2 * np.pi * timeLong / 100 + phase) * np.exp(timeLong / damp) + 0.01 * noise
+    Velocity = 2 * np.pi / 100 * np.cos(2 * np.pi * timeLong / 100 + phase) * np.exp(timeLong / damp) + 0.001 * noise
+    longData.append(np.column_stack([Position, Velocity]))
+
+f, axarr, reduction = niceplots.stacked_plots(
+    "Time (s)",
+    timeLong,
+    longData,
+    labels=["Position (m)", "Velocity (m/s)"],
+    figsize=(10, 6),
+    line_scaler=0.5,
+    filename=None,
+    decimate=True,
+    use_collections=True,
+    return_reduction=True,
+)
+print(f"Plotted {100 * reduction:.1f}% of the points")
+niceplots.save_figs(f, "opt_stacks_decimated", ["svg"])
@@ -0,0 +1,47 @@
+"""
+Pre-parsed style parameters
+===========================
+An example of using :func:`niceplots.get_style_params` to switch between styles, and to tweak a style's parameters,
+without re-reading the stylesheets each time, and of the draft quality styles for quick previews.
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import matplotlib.pyplot as plt
+import niceplots
+
+x = np.linspace(0, 2 * np.pi, 100)
+
+# The stylesheets are only parsed the first time their parameters are requested, so switching back and forth between
+# styles is cheap
+for styleName in ["doumont-light", "james-dark"]:
+    with plt.style.context(niceplots.get_style_params(styleName)):
+        fig, ax = plt.subplots()
+        ax.plot(x, np.sin(x), clip_on=False)
+        ax.set_xlabel("$x$")
+        niceplots.adjust_spines(ax)
+        niceplots.save_figs(fig, f"style_params-{styleName}", ["svg"])
+
+# Any of the style's parameters can be overridden, e.g. to use thinner lines
+with plt.style.context(niceplots.get_style_params("james-light", overrides={"lines.linewidth": 1.0})):
+    fig, ax = plt.subplots()
+    ax.plot(x, np.sin(x), clip_on=False)
+    ax.plot(x, np.cos(x), clip_on=False)
+    ax.set_xlabel("$x$")
+    niceplots.adjust_spines(ax)
+    niceplots.save_figs(fig, "style_params", ["svg"])
+
+# Draft quality styles look the same but are quicker to render, which is handy while iterating on a figure
+draftStyles = {
+    "doumont-dark": niceplots.get_style("doumont-dark", quality="draft"),
+    "doumont-light": niceplots.get_style_params("doumont-light", quality="draft"),
+}
+for styleName, style in draftStyles.items():
+    with plt.style.context(style):
+        fig, ax = plt.subplots()
+        ax.plot(x, np.sin(x), clip_on=False)
+        ax.set_xlabel("$x$")
+        niceplots.adjust_spines(ax)
+        niceplots.save_figs(fig, f"style_params-{styleName}-draft", ["svg"])
@@ -1,18 +1,11 @@
-import os
-from matplotlib import font_manager
-
 __version__ = "2.6.1"
 
+from .font_utils import addFonts, lazy_fonts_enabled
 
-def addFonts():
-    font_dirs = [os.path.join(os.path.dirname(__file__), "fonts")]
-    font_files = font_manager.findSystemFonts(fontpaths=font_dirs)
-
-    for font_file in font_files:
-        font_manager.fontManager.addfont(font_file)
-
-
-addFonts()
+# Register the bundled fonts up front unless the user has asked for them to be registered lazily, in which case
+# get_style registers the fonts used by a niceplots style the first time that style is requested
+if not lazy_fonts_enabled():
+    addFonts()
 
 from .utils import *
 from .parula import *
@@ -0,0 +1,308 @@
+"""
+==============================================================================
+NicePlots: Registration of the fonts bundled with niceplots
+==============================================================================
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import json
+import fnmatch
+import argparse
+import uuid
+import dataclasses
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import matplotlib
+from matplotlib import font_manager
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from . import __version__
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# Font files providing each of the families used by the niceplots stylesheets. Families that aren't in here fall back
+# to registering every bundled font.
+FONT_FAMILY_FILES = {
+    "CMU Bright": ["cmunbmo.ttf", "cmunbmr.ttf", "cmunbso.ttf", "cmunbsr.ttf"],
+    "Prompt": ["Prompt-*.ttf"],
+}
+
+# Environment variable that turns on lazy font registration, it must be set before niceplots is imported
+LAZY_FONTS_ENV_VAR = "NICEPLOTS_LAZY_FONTS"
+
+# Name of the file, in matplotlib's cache directory, that stores the parsed metadata of the bundled fonts
+FONT_CACHE_FILENAME = "niceplots-fontlist.json"
+
+# Paths of the bundled font files that have already been added to matplotlib's font manager
+_registeredFonts = set()
+
+# Contents of the font cache file, read the first time fonts are registered
+_fontCache = None
+
+# Paths of the stylesheets whose fonts have already been registered
+_registeredStyles = set()
+
+
+def lazy_fonts_enabled():
+    """Check whether lazy font registration has been requested through the ``NICEPLOTS_LAZY_FONTS`` environment
+    variable.
+
+    Returns
+    -------
+    bool
+        True if the bundled fonts should only be registered when a niceplots style that uses them is requested
+    """
+    return os.environ.get(LAZY_FONTS_ENV_VAR, "").strip().lower() in ["1", "true", "yes", "on"]
+
+
+def get_font_files(families=None):
+    """Get the paths of the font files bundled with niceplots.
+
+    Parameters
+    ----------
+    families : list of str, optional
+        Only return the files providing these font families, by default None, in which case all bundled font files are
+        returned. If any of the families is not one niceplots knows the files for, all bundled font files are returned.
+
+    Returns
+    -------
+    list of str
+        Paths to the font files
+    """
+    fontFiles = sorted(font_manager.findSystemFonts(fontpaths=[FONT_DIR]))
+    if families is None:
+        return fontFiles
+
+    patterns = []
+    for family in families:
+        if family not in FONT_FAMILY_FILES:
+            return fontFiles
+        patterns += FONT_FAMILY_FILES[family]
+
+    return [f for f in fontFiles if any(fnmatch.fnmatch(os.path.basename(f), p) for p in patterns)]
+
+
+def addFonts(families=None, useCache=True):
+    """Register the fonts bundled with niceplots with matplotlib's font manager. Fonts that have already been
+    registered are skipped, so this is safe to call multiple times.
+
+    Parsing the font files is the expensive part of registering them, so by default the parsed metadata is stored in
+    a cache file in matplotlib's cache directory and restored from there on later imports. Cache entries are
+    invalidated when the niceplots or matplotlib version changes or when a font file's size or modification time
+    changes.
+
+    Parameters
+    ----------
+    families : list of str, optional
+        Only register the files providing these font families, by default None, in which case all bundled fonts are
+        registered
+    useCache : bool, optional
+        Whether to restore the font metadata from, and save it to, the cache file, by default True
+    """
+    fontCache = _read_font_cache() if useCache else {}
+    cacheUpdated = False
+    restoredFonts = False
+
+    for font_file in get_font_files(families):
+        if font_file in _registeredFonts:
+            continue
+
+        fontName = os.path.basename(font_file)
+        stamp = _get_file_stamp(font_file)
+        cached = fontCache.get(fontName)
+
+        if cached is not None and cached["stamp"] == stamp:
+            font_manager.fontManager.ttflist.extend(_dict_to_entry(e, font_file) for e in cached["entries"])
+            restoredFonts = True
+        else:
+            entries = _parse_font_file(font_file)
+            fontCache[fontName] = {"stamp": stamp, "entries": [_entry_to_dict(e) for e in entries]}
+            cacheUpdated = True
+
+        _registeredFonts.add(font_file)
+
+    # addfont clears the font lookup cache itself, but we've bypassed it for the restored fonts
+    if restoredFonts:
+        font_manager.fontManager._findfont_cached.cache_clear()
+
+    if useCache and cacheUpdated:
+        _write_font_cache(fontCache)
+
+
+def get_font_cache_path():
+    """Get the path of the file caching the parsed metadata of the bundled fonts.
+
+    Returns
+    -------
+    str
+        Path to the cache file
+    """
+    return os.path.join(matplotlib.get_cachedir(), FONT_CACHE_FILENAME)
+
+
+def clear_font_cache():
+    """Delete the font cache file so the bundled fonts are parsed again the next time they are registered."""
+    global _fontCache
+    _fontCache = None
+    try:
+        os.remove(get_font_cache_path())
+    except FileNotFoundError:
+        pass
+
+
+def rebuild_font_cache():
+    """Parse all of the bundled fonts and write a fresh font cache file. Any fonts that aren't yet registered with
+    matplotlib's font manager are registered in the process.
+
+    This can also be run from the command line with ``niceplots-font-cache``.
+
+    Returns
+    -------
+    str
+        Path to the cache file
+    """
+    global _fontCache
+    clear_font_cache()
+
+    fontCache = {}
+    for font_file in get_font_files():
+        if font_file in _registeredFonts:
+            entries = [e for e in font_manager.fontManager.ttflist if e.fname == font_file]
+        else:
+            entries = _parse_font_file(font_file)
+            _registeredFonts.add(font_file)
+        fontCache[os.path.basename(font_file)] = {
+            "stamp": _get_file_stamp(font_file),
+            "entries": [_entry_to_dict(e) for e in entries],
+        }
+
+    _fontCache = fontCache
+    _write_font_cache(fontCache)
+    return get_font_cache_path()
+
+
+def _get_cache_key():
+    """Get the versions the font cache is only valid for, the font manager entries can change between matplotlib
+    versions."""
+    return {"niceplots": __version__, "matplotlib": matplotlib.__version__}
+
+
+def _get_file_stamp(fontFile):
+    """Get the size and modification time of a font file, used to check whether a cache entry is stale."""
+    stat = os.stat(fontFile)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _parse_font_file(fontFile):
+    """Add a font file to matplotlib's font manager and return the font entries that were created for it."""
+    numEntries = len(font_manager.fontManager.ttflist)
+    font_manager.fontManager.addfont(fontFile)
+    return font_manager.fontManager.ttflist[numEntries:]
+
+
+def _entry_to_dict(entry):
+    """Convert a font entry to a JSON serialisable dict, the file path is left out as it depends on the install."""
+    entryDict = dataclasses.asdict(entry)
+    entryDict.pop("fname")
+    return entryDict
+
+
+def _dict_to_entry(entryDict, fontFile):
+    """Recreate a font entry from its cached dict."""
+    return font_manager.FontEntry(fname=fontFile, **entryDict)
+
+
+def _read_font_cache():
+    """Read the font cache file, returning an empty cache if it doesn't exist, can't be read, or is out of date."""
+    global _fontCache
+    if _fontCache is None:
+        _fontCache = {}
+        try:
+            with open(get_font_cache_path()) as f:
+                cache = json.load(f)
+            if cache["key"] == _get_cache_key():
+                _fontCache = cache["fonts"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    return _fontCache
+
+
+def _write_font_cache(fontCache):
+    """Write the font cache file. Failing to write it isn't fatal, the fonts will just be parsed again next time."""
+    cachePath = get_font_cache_path()
+    # Write to a uniquely named temporary file first so concurrent imports never see a partially written cache, it's
+    # not made with mkstemp as the cache would then only be readable by its owner
+    tmpPath = os.path.join(os.path.dirname(cachePath), f".{FONT_CACHE_FILENAME}-{uuid.uuid4().hex[:12]}")
+    try:
+        with open(tmpPath, "w") as f:
+            json.dump({"key": _get_cache_key(), "fonts": fontCache}, f)
+        os.replace(tmpPath, cachePath)
+    except OSError:
+        try:
+            os.remove(tmpPath)
+        except OSError:
+            pass
+
+
+def get_style_font_families(stylePath):
+    """Get the names of the font families a stylesheet refers to.
+
+    Parameters
+    ----------
+    stylePath : str
+        Path to the ``.mplstyle`` file
+
+    Returns
+    -------
+    list of str
+        Font family names, excluding the generic ones like "sans-serif"
+    """
+    params = matplotlib.rc_params_from_file(stylePath, use_default_template=False)
+    genericFamilies = ["serif", "sans-serif", "cursive", "fantasy", "monospace"]
+
+    families = []
+    for family in params.get("font.family", []):
+        if family in genericFamilies:
+            families += params.get(f"font.{family}", [])
+        else:
+            families.append(family)
+
+    return families
+
+
+def add_style_fonts(stylePath):
+    """Register only the bundled fonts that a stylesheet uses. Each stylesheet is only read the first time this is
+    called with it.
+
+    Parameters
+    ----------
+    stylePath : str
+        Path to the ``.mplstyle`` file
+    """
+    if stylePath in _registeredStyles:
+        return
+
+    families = get_style_font_families(stylePath)
+    if len(families) > 0:
+        addFonts(families)
+    _registeredStyles.add(stylePath)
+
+
+def main():
+    """Command line interface for managing the font cache, installed as ``niceplots-font-cache``."""
+    parser = argparse.ArgumentParser(description="Manage the cache of the fonts bundled with niceplots")
+    parser.add_argument("--clear", action="store_true", help="Delete the font cache instead of rebuilding it")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_font_cache()
+        print("Cleared the niceplots font cache")
+    else:
+        print(f"Rebuilt the niceplots font cache at {rebuild_font_cache()}")
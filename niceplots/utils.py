@@ -10,25 +10,77 @@ NicePlots: A collection of stylesheets and helper functions for matplotlib
 import warnings
 import os
 import copy
-from collections import OrderedDict
+import time
+import pickle
+import uuid
+import shutil
+import json
+import hashlib
+import functools
+from collections import OrderedDict, ChainMap, Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from types import MappingProxyType, FunctionType, MethodType, BuiltinFunctionType, ModuleType, CodeType
 
 # ==============================================================================
 # External Python modules
 # ==============================================================================
+import matplotlib
 from matplotlib import patheffects
 from matplotlib.collections import LineCollection
+from matplotlib.ticker import MaxNLocator
 import matplotlib.colors as mcolor
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.interpolate import make_interp_spline, Akima1DInterpolator
 
 # ==============================================================================
 # Extension modules
 # ==============================================================================
 from .parula import parula_map
-
-
-def get_style(styleName="doumont-light"):
+from .font_utils import lazy_fonts_enabled, add_style_fonts, addFonts
+from . import __version__
+
+STYLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles")
+
+# Maps the names of the niceplots styles to their stylesheet paths, filled on first use and by refresh_styles
+_styleRegistry = None
+
+# rcParams that the colors returned by get_colors and get_colors_list come from
+_PALETTE_PARAMS = [
+    "axes.prop_cycle",
+    "keymap.help",
+    "axes.edgecolor",
+    "axes.facecolor",
+    "text.color",
+    "axes.labelcolor",
+]
+
+# rcParams that the "draft" quality level sets on top of a style to make figures faster to render. The colors, fonts and
+# spines are left alone so drafts still look like the final figures.
+DRAFT_PARAMS = {
+    "savefig.dpi": 100,
+    "figure.constrained_layout.use": False,
+    "figure.autolayout": True,
+    "path.simplify": True,
+    "path.simplify_threshold": 0.5,
+    "agg.path.chunksize": 10000,
+    "text.usetex": False,
+    "svg.fonttype": "none",
+    "pdf.compression": 1,
+}
+
+# Number of line segments above which plot_colored_line and plot_opt_path rasterize their lines by default, above this
+# vector files of the lines get very large and slow to open
+RASTERIZE_THRESHOLD = 10000
+
+# The parsed rcParams of each style, filled the first time each style's parameters are requested
+_styleParamsCache = {}
+
+# The palette rcParams set by each niceplots style, filled the first time each style's colors are requested
+_paletteTable = {}
+
+
+def get_style(styleName="doumont-light", quality="final"):
     """
     Get the stylesheet to pass to matplotlib's style setting functions. This function
     works both with niceplots styles and matplotlib's built-in styles. Usage examples::
@@ -47,6 +99,9 @@ def get_style(styleName="doumont-light"):
         plt.style.use(niceplots.get_style("james-dark"))  # niceplots james dark style
         plt.style.use(niceplots.get_style("default"))  # matplotlib default style
 
+        # Quicker to render version of a style for previews
+        plt.style.use(niceplots.get_style("james-dark", quality="draft"))
+
     Parameters
     ----------
     styleName : str, optional
@@ -57,18 +112,93 @@ def get_style(styleName="doumont-light"):
             - james-dark: a really cool alternative to classic niceplots
             - james-light: a version of james with a light background, naturally
 
+    quality : str, optional
+        Either "final", the default, for publication quality figures, or "draft" for figures that look the same but
+        are much faster to render. Draft figures are saved at 100 dpi, use tight layout instead of the slower
+        constrained layout, and simplify paths and text more aggressively, see ``niceplots.utils.DRAFT_PARAMS`` for
+        the full list of changes.
+
     Returns
     -------
-    str
-        The style string to be passed to one of matplotlib's style setting functions.
+    str or list
+        The style string to be passed to one of matplotlib's style setting functions. For draft quality, a list of
+        the style string and the draft rcParams, which matplotlib's style setting functions also accept.
+    """
+    if quality not in ["final", "draft"]:
+        raise ValueError(f"quality: {quality} is not supported")
+
+    # If the style is a niceplots style, use the file path
+    stylePath = _get_style_registry().get(styleName)
+    if stylePath is not None:
+        # If the fonts weren't registered on import, register the ones this style needs now
+        if lazy_fonts_enabled():
+            add_style_fonts(stylePath)
+
+    # Otherwise assume it's a matplotlib style and just use the style name
+    else:
+        stylePath = styleName
+
+    if quality == "draft":
+        return [stylePath, dict(DRAFT_PARAMS)]
+    return stylePath
+
+
+def get_style_params(styleName="doumont-light", overrides=None, quality="final"):
+    """
+    Get the rcParams set by a style as a read-only dictionary. Unlike the path returned by :func:`get_style`, the
+    stylesheet is only parsed the first time this is called for each style, so this is the cheaper option if you
+    switch between styles a lot. The dictionary can be passed straight to matplotlib's style setting functions::
+
+        import matplotlib.pyplot as plt
+        import niceplots
+
+        plt.style.use(niceplots.get_style_params())
+
+        # Override some of the style's parameters
+        darkParams = niceplots.get_style_params("james-dark", overrides={"savefig.dpi": 100})
+        with plt.style.context(darkParams):
+            plt.plot([0, 1], [0, 1])
+
+    Parameters
+    ----------
+    styleName : str, optional
+        Name of desired style, can be any of the niceplots styles or the styles in matplotlib's style library
+        (``plt.style.available``), by default uses doumont-light style.
+    overrides : dict, optional
+        rcParams to set on top of the style's ones, by default None
+    quality : str, optional
+        Either "final", the default, or "draft", see :func:`get_style` for details
+
+    Returns
+    -------
+    mappingproxy
+        Read-only dictionary of the rcParams set by the style
     """
-    # If the style is a niceplots style, return the file path
-    if styleName in get_available_styles():
-        curDir = os.path.dirname(os.path.abspath(__file__))
-        return os.path.join(curDir, "styles", styleName + ".mplstyle")
+    if quality not in ["final", "draft"]:
+        raise ValueError(f"quality: {quality} is not supported")
+
+    if styleName not in _styleParamsCache:
+        stylePath = get_style(styleName)
+        if stylePath != styleName:
+            styleParams = matplotlib.rc_params_from_file(stylePath, use_default_template=False)
+        elif styleName in plt.style.library:
+            styleParams = plt.style.library[styleName]
+        else:
+            raise ValueError(f"{styleName} is not a niceplots style or one of matplotlib's style library")
+        _styleParamsCache[styleName] = MappingProxyType(dict(styleParams))
+    elif lazy_fonts_enabled():
+        get_style(styleName)
+
+    extraParams = dict(DRAFT_PARAMS) if quality == "draft" else {}
+    if overrides:
+        extraParams.update(overrides)
 
-    # Otherwise assume it's a matplotlib style and just return the style name
-    return styleName
+    styleParams = _styleParamsCache[styleName]
+    if extraParams:
+        # RcParams validates the extra parameters the same way matplotlib would when they're applied
+        styleParams = MappingProxyType({**styleParams, **matplotlib.RcParams(extraParams)})
+
+    return styleParams
 
 
 def get_colors(styleName=None):
@@ -99,30 +229,14 @@ def get_colors(styleName=None):
             - "Label": axis label color
     """
 
-    def get_colors_from_current_style():
-        # Get the color codes and their names from the (hopefully) "special" parameter
-        color_codes = get_colors_list()
-        color_names = plt.rcParams["keymap.help"]
-
-        # Ensure that the amount of color names matches the amount of colors
-        if len(color_codes) != len(color_names):
-            raise ValueError(
-                "The colors are not properly named in the stylesheet, please open an issue on GitHub with the details!"
-            )
-
-        colors = OrderedDict(zip(color_names, color_codes))
-        colors["Axis"] = plt.rcParams["axes.edgecolor"]
-        colors["Background"] = plt.rcParams["axes.facecolor"]
-        colors["Text"] = plt.rcParams["text.color"]
-        colors["Label"] = plt.rcParams["axes.labelcolor"]
-
-        return colors
-
     if styleName:
+        palette = _get_style_palette(styleName)
+        if palette is not None:
+            return _get_colors_from_params(palette)
         with plt.style.context(get_style(styleName)):
-            return get_colors_from_current_style()
+            return _get_colors_from_params(plt.rcParams)
     else:
-        return get_colors_from_current_style()
+        return _get_colors_from_params(plt.rcParams)
 
 
 def get_colors_list(styleName=None):
@@ -146,12 +260,58 @@ def get_colors_list(styleName=None):
         List of the colors for the requested style.
     """
     if styleName:
+        palette = _get_style_palette(styleName)
+        if palette is not None:
+            return palette["axes.prop_cycle"].by_key()["color"]
         with plt.style.context(get_style(styleName)):
             return plt.rcParams["axes.prop_cycle"].by_key()["color"]
     else:
         return plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
 
+def _get_colors_from_params(params):
+    """Build the dictionary returned by get_colors from a mapping of rcParams."""
+    # Get the color codes and their names from the (hopefully) "special" parameter
+    color_codes = params["axes.prop_cycle"].by_key()["color"]
+    color_names = params["keymap.help"]
+
+    # Ensure that the amount of color names matches the amount of colors
+    if len(color_codes) != len(color_names):
+        raise ValueError(
+            "The colors are not properly named in the stylesheet, please open an issue on GitHub with the details!"
+        )
+
+    colors = OrderedDict(zip(color_names, color_codes))
+    colors["Axis"] = params["axes.edgecolor"]
+    colors["Background"] = params["axes.facecolor"]
+    colors["Text"] = params["text.color"]
+    colors["Label"] = params["axes.labelcolor"]
+
+    return colors
+
+
+def _get_style_palette(styleName):
+    """Get the palette rcParams of a niceplots style without applying the style.
+
+    Each stylesheet is only parsed the first time its palette is requested. Just like when the style is applied on top
+    of the current one, any palette rcParams the stylesheet doesn't set are taken from the current rcParams.
+
+    Returns
+    -------
+    collections.ChainMap or None
+        The palette rcParams, or None if ``styleName`` isn't a niceplots style
+    """
+    stylePath = _get_style_registry().get(styleName)
+    if stylePath is None:
+        return None
+
+    if styleName not in _paletteTable:
+        styleParams = get_style_params(styleName)
+        _paletteTable[styleName] = {p: styleParams[p] for p in _PALETTE_PARAMS if p in styleParams}
+
+    return ChainMap(_paletteTable[styleName], plt.rcParams)
+
+
 def get_available_styles():
     """
     Get a list of the names of styles available.
@@ -161,15 +321,37 @@ def get_available_styles():
     list
         The names of the available styles.
     """
-    curDir = os.path.dirname(os.path.abspath(__file__))
-    styleFilenames = os.listdir(os.path.join(curDir, "styles"))
-    styles = []
-    for s in styleFilenames:
+    return list(_get_style_registry().keys())
+
+
+def refresh_styles():
+    """
+    Rescan the niceplots styles directory. The available styles are only looked up once and then cached, so call
+    this if you add a new ``.mplstyle`` file to the styles directory after niceplots has been imported.
+
+    Returns
+    -------
+    list
+        The names of the available styles.
+    """
+    global _styleRegistry
+    styles = {}
+    for s in os.listdir(STYLES_DIR):
         name, ext = os.path.splitext(s)
         if ext == ".mplstyle":
-            styles.append(name)
-    styles.sort()  # alphabetize
-    return styles
+            styles[name] = os.path.join(STYLES_DIR, s)
+    _styleRegistry = dict(sorted(styles.items()))  # alphabetize
+    _styleParamsCache.clear()
+    _paletteTable.clear()
+    return get_available_styles()
+
+
+def _get_style_registry():
+    """Get the dictionary mapping niceplots style names to stylesheet paths, scanning the styles directory if it
+    hasn't been scanned yet."""
+    if _styleRegistry is None:
+        refresh_styles()
+    return _styleRegistry
 
 
 def handle_close(evt):
@@ -363,7 +545,7 @@ def label_line_ends(ax, lines=None, labels=None, colors=None, x_offset_pts=6, y_
     return annotations
 
 
-def horiz_bar(labels, times, header, nd=1, size=[5, 0.5], color=None):
+def horiz_bar(labels, times, header, nd=1, size=[5, 0.5], color=None, singleAxes=False):
     """Creates a horizontal bar chart to compare positive numbers.
 
     Parameters
@@ -381,13 +563,17 @@ def horiz_bar(labels, times, header, nd=1, size=[5, 0.5], color=None):
         the size of the final figure (iffy results)
     color : str
         hexcode for the color of the scatter points used
+    singleAxes : bool, optional
+        Whether to draw all of the bars on a single axes, using one collection for the lines and one for the points,
+        rather than creating a subplot for each bar, by default False. The chart looks the same, but it is much faster
+        to create and draw when there are many bars.
 
     Returns
     -------
     fig: matplotlib Figure
         Figure created
-    axes: array of matplotlib Axes
-        The subplot axes, one for each bar
+    axes: array of matplotlib Axes or matplotlib Axes
+        The subplot axes, one for each bar, or the single axes if ``singleAxes`` is True
     """
 
     # Use the first color if none is specified
@@ -402,6 +588,9 @@ def horiz_bar(labels, times, header, nd=1, size=[5, 0.5], color=None):
     height = size[1] * num
     t_max = max(times)
 
+    if singleAxes:
+        return _horiz_bar_single_axes(labels, times, header, nd, width, height, color, line_color)
+
     # Create the corresponding number of subplots for each individual timing
     fig, axes = plt.subplots(num, 1, figsize=[width, height])
 
@@ -455,6 +644,60 @@ def horiz_bar(labels, times, header, nd=1, size=[5, 0.5], color=None):
     return fig, axes
 
 
+def _horiz_bar_single_axes(labels, times, header, nd, width, height, color, line_color):
+    """Draw the horiz_bar chart on a single axes, with one collection for all of the bar lines and one for all of
+    the points."""
+    num = len(times)
+    t_max = max(times)
+    xMax = t_max * 1.05
+
+    # The first bar goes at the top
+    y = np.arange(num - 1, -1, -1, dtype=float)
+
+    fig, ax = plt.subplots(figsize=[width, height])
+
+    # Draw the gray lines and yellow dots
+    segments = np.zeros((num, 2, 2))
+    segments[:, 1, 0] = xMax
+    segments[:, :, 1] = y[:, np.newaxis]
+    ax.add_collection(LineCollection(segments, colors=line_color, lw=3, zorder=0, alpha=0.5))
+    ax.scatter(times, y, c=color, lw=0, s=100, zorder=1, clip_on=False)
+
+    # Set chart properties
+    ax.set_xlim(0, xMax)
+    ax.set_ylim(-0.5, num - 0.5)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.tick_params(axis="both", which="both", left=False, right=False, bottom=False, top=False, labelbottom=False)
+
+    # Use the y tick labels for the bar labels, styled like the y labels used in the subplot version, and annotate the
+    # values on the right
+    ax.set_yticks(y)
+    ax.set_yticklabels(
+        labels,
+        fontsize=plt.rcParams["axes.labelsize"],
+        fontweight=plt.rcParams["axes.labelweight"],
+        color=plt.rcParams["axes.labelcolor"],
+    )
+    ax.tick_params(axis="y", pad=plt.rcParams["axes.labelpad"])
+    for t, yBar in zip(times, y):
+        string = "{number:.{digits}f}".format(number=t, digits=nd)
+        ax.annotate(
+            string,
+            xy=(1, yBar),
+            xytext=(6, 0),
+            xycoords=ax.get_yaxis_transform(),
+            textcoords="offset points",
+            va="center",
+        )
+
+    # Create the top bar line
+    ax.text(0, num - 0.2, header[0], ha="right", fontweight="bold", fontsize="large")
+    ax.text(t_max, num - 0.2, header[1], ha="left", fontweight="bold", fontsize="large")
+
+    return fig, ax
+
+
 def stacked_plots(
     xlabel,
     xdata,
@@ -469,10 +712,79 @@ def stacked_plots(
     line_scaler=1.0,
     xlim=None,
     dpi=200,
+    reuse_output=False,
+    decimate=False,
+    use_collections=False,
+    labels=None,
+    return_reduction=False,
 ):
-    # If it's a dictionary, make it into a list so we can generically loop over it
-    if isinstance(data_dict_list, dict):
-        data_dict_list = [data_dict_list]
+    """Create a column of plots that share the same x data, e.g. the time histories of several variables
+
+    Parameters
+    ----------
+    xlabel : str
+        Label for the x axis of the bottom plot
+    xdata : iterable
+        x data shared by all of the plots
+    data_dict_list : dict, array, or list of dicts or arrays
+        y data to plot, one plot is created for each key, which is used as that plot's y label. The values can either be
+        the y data, or a dict containing the y data under "data" and either the y axis "limits" or the y axis "ticks".
+        Pass a list of dicts to plot multiple lines on each plot, in which case the keys of the first dict are used.
+        Any mapping can be used in place of a dict, e.g. one of memory-mapped arrays. The y data can also be given as a
+        2D array with one column per plot, in which case ``labels`` must be given, or as a structured array with one
+        field per plot. The columns and fields are plotted directly as views of the array, so no data is copied.
+    figsize : tuple of two float, optional
+        Size of the figure, by default (12, 10)
+    outward : bool, optional
+        Whether to offset the spines outward, by default True
+    filename : str, optional
+        File to save the figure to, by default "stacks.png". Pass None to not save the figure, e.g. to save it later
+        with :func:`save_figs` or to combine it with other plots first.
+    xticks : iterable, optional
+        x tick locations, by default None, in which case matplotlib's default ticks are used
+    cushion : float, optional
+        Space left above and below the y ticks, as a fraction of their range, when "ticks" are given, by default 0.1
+    colors : list of str, optional
+        Colors to use for each dict in data_dict_list, by default the current style's colors
+    lines_only : bool, optional
+        Whether to only plot lines rather than lines and markers, by default False
+    line_scaler : float, optional
+        Scaling factor for the line widths and marker sizes, by default 1.0
+    xlim : iterable of two float, optional
+        x axis limits, by default None
+    dpi : int, optional
+        Resolution to save png files at, by default 200
+    reuse_output : bool, optional
+        Whether to keep the existing file if it was saved from the same inputs, rather than rendering the figure again,
+        see :func:`save_figs`, by default False
+    decimate : bool or int, optional
+        Whether to reduce the number of points plotted in long data series, by default False. Each series is split into
+        bins along the x axis, and only the first, last, minimum and maximum points in each bin are kept (see
+        :func:`get_decimation_indices`), so the lines look the same but are much faster to draw and make much smaller
+        vector files. Pass True to use one bin per pixel of the figure width at the given dpi, or an integer number of
+        bins. Markers are also left off any series with too many points for them to be told apart. The x data must be
+        sorted for a series to be decimated.
+    use_collections : bool, optional
+        Whether to draw all of the series on each plot with a single line collection and a single marker collection,
+        rather than a line and a set of markers per series, by default False. This draws the same plot with far fewer
+        artists, which is much faster when there are many series.
+    labels : list of str, optional
+        y labels of the plots when the y data is given as arrays, by default None. These are required for 2D arrays,
+        and replace the field names of structured arrays.
+    return_reduction : bool, optional
+        Whether to also return the fraction of the data points that were plotted, by default False
+
+    Returns
+    -------
+    f : matplotlib Figure
+        Figure created
+    axarr : array of matplotlib Axes
+        The axes of each plot
+    reduction : float
+        The number of points plotted divided by the number of points in the data, which is 1 if ``decimate`` isn't
+        used. Only returned if ``return_reduction`` is True
+    """
+    data_dict_list = _get_stacked_data_dicts(data_dict_list, labels)
 
     if colors is None:
         colors = get_colors_list()
@@ -480,7 +792,8 @@ def stacked_plots(
     data_dict = data_dict_list[0]
     n = len(data_dict)
 
-    f, axarr = plt.subplots(n, figsize=figsize)
+    f, axarr = plt.subplots(n, figsize=figsize, squeeze=False)
+    axarr = axarr[:, 0]
 
     for i, (ylabel, ydata) in enumerate(data_dict.items()):
         if isinstance(ydata, dict):
@@ -500,28 +813,99 @@ def stacked_plots(
         if xlim is not None:
             if isinstance(ydata, dict):
                 ydata = ydata["data"]
-            ydata = np.array(ydata, dtype="float")
+            ydata = np.asarray(ydata, dtype="float")
             no_nan_y = ydata[np.isfinite(ydata)]
             ylim = [np.mean(no_nan_y), np.mean(no_nan_y)]
             axarr[i].scatter(list(xlim), ylim, alpha=0.0)
 
+    numBins = int(figsize[0] * dpi) if decimate is True else int(decimate)
+    maxMarkers = _get_max_markers(figsize[0], 10 * line_scaler)
+    numPoints = 0
+    numPlotted = 0
+
+    # Work out the data to draw for each series on each plot, only converting the x data once
+    xArray = np.asarray(xdata, dtype=float) if decimate or use_collections else xdata
+    panelSeries = [[] for _ in range(n)]
     for j, data_dict in enumerate(data_dict_list):
         for i, (_, ydata) in enumerate(data_dict.items()):
             if isinstance(ydata, dict):
                 ydata = ydata["data"]
-            axarr[i].plot(xdata, ydata, clip_on=False, lw=6 * line_scaler, color=colors[j])
-            if not lines_only:
-                axarr[i].scatter(
-                    xdata,
-                    ydata,
-                    clip_on=False,
-                    edgecolors=axarr[i].get_facecolor(),
-                    s=100 * line_scaler**2,
-                    lw=1.5 * line_scaler,
-                    zorder=100,
-                    color=colors[j],
-                )
+            xPlot = xArray
+            showMarkers = not lines_only
+
+            numPoints += len(xArray)
+            if decimate:
+                ydata = np.asarray(ydata, dtype=float)
+                keep = get_decimation_indices(xArray, ydata, numBins)
+                xPlot = xArray[keep]
+                ydata = ydata[keep]
+                numPlotted += len(keep)
+                showMarkers = showMarkers and len(keep) <= maxMarkers
+            else:
+                numPlotted += len(xArray)
+                if use_collections:
+                    ydata = np.asarray(ydata, dtype=float)
+
+            panelSeries[i].append((colors[j], xPlot, ydata, showMarkers))
+
+    markerKwargs = {
+        "clip_on": False,
+        "s": 100 * line_scaler**2,
+        "lw": 1.5 * line_scaler,
+        "zorder": 100,
+    }
+    for ax, series in zip(axarr, panelSeries):
+        if use_collections:
+            _add_stacked_collections(ax, series, line_scaler, markerKwargs)
+            continue
+
+        for color, xPlot, yPlot, showMarkers in series:
+            ax.plot(xPlot, yPlot, clip_on=False, lw=6 * line_scaler, color=color)
+            if showMarkers:
+                ax.scatter(xPlot, yPlot, edgecolors=ax.get_facecolor(), color=color, **markerKwargs)
+
+    _format_stacked_axes(f, axarr, xlabel, outward, xticks)
+
+    # plt.tight_layout()
+
+    if filename is not None:
+        inputs = None
+        if reuse_output:
+            inputs = [
+                xlabel,
+                xdata,
+                data_dict_list,
+                figsize,
+                outward,
+                xticks,
+                cushion,
+                colors,
+                lines_only,
+                line_scaler,
+                xlim,
+                decimate,
+                use_collections,
+                labels,
+            ]
+        _save_stacked_plots(f, filename, dpi, inputs)
+
+    if return_reduction:
+        return f, axarr, numPlotted / max(numPoints, 1)
+    return f, axarr
+
 
+def _save_stacked_plots(f, filename, dpi, inputs=None):
+    """Save a stacked plots figure, tightly cropped and at the given resolution for png files."""
+    saveKwargs = {"bbox_inches": "tight"}
+    if "png" in filename:
+        saveKwargs["dpi"] = dpi
+
+    fileName, ext = os.path.splitext(filename)
+    save_figs(f, fileName, ext or plt.rcParams["savefig.format"], inputs=inputs, **saveKwargs)
+
+
+def _format_stacked_axes(f, axarr, xlabel, outward, xticks):
+    """Apply the stacked_plots spine, tick, and label formatting to a column of axes."""
     for i, ax in enumerate(axarr):
         adjust_spines(ax, outward=outward)
         if i < len(axarr) - 1:
@@ -534,14 +918,392 @@ def stacked_plots(
     f.align_labels()
     axarr[-1].set_xlabel(xlabel)
 
-    # plt.tight_layout()
 
-    if "png" in filename:
-        plt.savefig(filename, bbox_inches="tight", dpi=dpi)
+def _get_stacked_data_dicts(data, labels=None):
+    """Convert the y data passed to stacked_plots into a list of mappings from each plot's label to its y data. Array
+    columns and fields are returned as views, so no array data is copied."""
+    # If it's a single set of data, make it into a list so we can generically loop over it
+    if isinstance(data, (Mapping, np.ndarray)):
+        data = [data]
+
+    dataDicts = []
+    for dataSet in data:
+        if isinstance(dataSet, np.ndarray) and dataSet.dtype.names is not None:
+            names = dataSet.dtype.names
+            setLabels = names if labels is None else labels
+            if len(setLabels) != len(names):
+                raise ValueError(f"Got {len(setLabels)} labels for a structured array with {len(names)} fields")
+            dataSet = {label: dataSet[name] for label, name in zip(setLabels, names)}
+        elif isinstance(dataSet, np.ndarray):
+            if dataSet.ndim != 2:
+                raise ValueError(f"y data arrays must be 2D with one column per plot, got a {dataSet.ndim}D array")
+            if labels is None or len(labels) != dataSet.shape[1]:
+                raise ValueError("labels must be given for each column when the y data is a 2D array")
+            dataSet = {label: dataSet[:, i] for i, label in enumerate(labels)}
+        dataDicts.append(dataSet)
+
+    return dataDicts
+
+
+def _add_stacked_collections(ax, series, line_scaler, markerKwargs):
+    """Draw all of the series on one of the stacked_plots axes using one line collection and one marker collection.
+    Each series is a tuple of (color, x data, y data, whether to show markers)."""
+    seriesColors = mcolor.to_rgba_array([color for color, _, _, _ in series])
+    lengths = [len(yPlot) for _, _, yPlot, _ in series]
+
+    # If all the series are the same length the lines can be built as one 3D array rather than one array per series
+    if len(set(lengths)) == 1 and all(xPlot is series[0][1] for _, xPlot, _, _ in series):
+        lines = np.empty((len(series), lengths[0], 2))
+        lines[:, :, 0] = series[0][1]
+        lines[:, :, 1] = [yPlot for _, _, yPlot, _ in series]
     else:
-        plt.savefig(filename, bbox_inches="tight")
+        lines = [np.column_stack([xPlot, yPlot]) for _, xPlot, yPlot, _ in series]
+
+    ax.add_collection(
+        LineCollection(
+            lines,
+            colors=seriesColors,
+            lw=6 * line_scaler,
+            capstyle=plt.rcParams["lines.solid_capstyle"],
+            joinstyle=plt.rcParams["lines.solid_joinstyle"],
+            clip_on=False,
+        )
+    )
 
-    return f, axarr
+    markerSeries = [i for i, (_, _, _, showMarkers) in enumerate(series) if showMarkers]
+    if len(markerSeries) > 0:
+        ax.scatter(
+            np.concatenate([series[i][1] for i in markerSeries]),
+            np.concatenate([series[i][2] for i in markerSeries]),
+            c=np.repeat(seriesColors[markerSeries], [lengths[i] for i in markerSeries], axis=0),
+            edgecolors=ax.get_facecolor(),
+            **markerKwargs,
+        )
+
+    ax.autoscale_view()
+
+
+class LiveStackedPlots:
+    """A column of plots sharing the same x data, laid out like :func:`stacked_plots`, that new data can be appended
+    to as it arrives, e.g. to watch the history of a running optimisation.
+
+    Appending data only updates the data of the existing lines and markers, and the axis limits are updated from the
+    new points alone, so the cost of an append doesn't grow with the amount of data already plotted. The artists are
+    given the new data when the figure is next drawn or saved. The figure can be redrawn on screen and re-saved to a
+    file after each append, at most once every ``draw_interval`` and ``save_interval`` seconds respectively.
+
+    Parameters
+    ----------
+    xlabel : str
+        Label for the x axis of the bottom plot
+    labels : list of str
+        y labels of the plots, one plot is created for each
+    num_series : int, optional
+        Number of lines to plot on each plot, by default 1
+    figsize : tuple of two float, optional
+        Size of the figure, by default (12, 10)
+    outward : bool, optional
+        Whether to offset the spines outward, by default True
+    filename : str, optional
+        File to save the figure to, by default None, in which case the figure is only saved when :meth:`save` is called
+        with a file name
+    xticks : iterable, optional
+        x tick locations, by default None, in which case matplotlib's default ticks are used
+    colors : list of str, optional
+        Colors to use for each series, by default the current style's colors
+    lines_only : bool, optional
+        Whether to only plot lines rather than lines and markers, by default False. Markers are also hidden once a
+        series has too many points for them to be told apart.
+    line_scaler : float, optional
+        Scaling factor for the line widths and marker sizes, by default 1.0
+    dpi : int, optional
+        Resolution to save png files at, by default 200
+    save_interval : float, optional
+        Minimum time in seconds between re-saving the figure when data is appended, by default 10
+    draw_interval : float, optional
+        Minimum time in seconds between redrawing the figure on screen when data is appended, by default None, in which
+        case the figure is only redrawn when :meth:`draw` is called
+    blit : bool, optional
+        Whether to only redraw the lines and markers, rather than the whole figure, when the axis limits haven't
+        changed, by default False. This only has an effect with backends that support blitting. The background the
+        data is drawn onto is captured after every full draw of the figure, so it is kept up to date when the figure
+        is resized.
+    """
+
+    def __init__(
+        self,
+        xlabel,
+        labels,
+        num_series=1,
+        figsize=(12, 10),
+        outward=True,
+        filename=None,
+        xticks=None,
+        colors=None,
+        lines_only=False,
+        line_scaler=1.0,
+        dpi=200,
+        save_interval=10.0,
+        draw_interval=None,
+        blit=False,
+    ):
+        if colors is None:
+            colors = get_colors_list()
+
+        self.labels = list(labels)
+        self.filename = filename
+        self.dpi = dpi
+        self.save_interval = save_interval
+        self.draw_interval = draw_interval
+
+        self._maxMarkers = _get_max_markers(figsize[0], 10 * line_scaler)
+
+        self.fig, self.axes = plt.subplots(len(self.labels), figsize=figsize, squeeze=False)
+        self.axes = self.axes[:, 0]
+
+        # Each series has its own x data, and a growable (capacity x 2) buffer of points for each plot which the lines
+        # and markers display views of
+        self._numPoints = [0] * num_series
+        self._buffers = [[np.empty((0, 2)) for _ in self.labels] for _ in range(num_series)]
+        self.lines = [[] for _ in range(num_series)]
+        self.markers = [[] for _ in range(num_series)]
+
+        for ax, label in zip(self.axes, self.labels):
+            ax.set_ylabel(label, rotation="horizontal", horizontalalignment="right")
+            for j in range(num_series):
+                (line,) = ax.plot([], [], clip_on=False, lw=6 * line_scaler, color=colors[j])
+                self.lines[j].append(line)
+                if not lines_only:
+                    self.markers[j].append(
+                        ax.scatter(
+                            np.empty(0),
+                            np.empty(0),
+                            clip_on=False,
+                            edgecolors=ax.get_facecolor(),
+                            s=100 * line_scaler**2,
+                            lw=1.5 * line_scaler,
+                            zorder=100,
+                            color=colors[j],
+                        )
+                    )
+
+        _format_stacked_axes(self.fig, self.axes, xlabel, outward, xticks)
+
+        # When blitting, the lines and markers are left out of full draws of the figure, after each of which the
+        # background they're blitted onto is captured, so it stays up to date when the figure is resized
+        self.blit = blit and self.fig.canvas.supports_blit
+        self._background = None
+        self._backgroundBounds = None
+        self._saving = False
+        if self.blit:
+            for artist in self._get_data_artists():
+                artist.set_animated(True)
+            self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self._staleAxes = set()
+        self._staleData = set()
+        self._lastDraw = -np.inf
+        self._lastSave = -np.inf
+
+    def append(self, x, values, series=0):
+        """Append new points to one of the series.
+
+        Parameters
+        ----------
+        x : float or array
+            x values of the new points
+        values : dict
+            y values of the new points for each plot, keyed by the plot labels. Plots that are missing from the dict get
+            NaN, which leaves a gap in their line.
+        series : int, optional
+            Index of the series to append to, by default 0
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        numNew = len(x)
+        start = self._numPoints[series]
+        end = start + numNew
+
+        for i, (ax, label) in enumerate(zip(self.axes, self.labels)):
+            buffer = self._buffers[series][i]
+            if end > len(buffer):
+                # Grow the buffer geometrically so appending is amortised constant time per point
+                newBuffer = np.empty((max(end, 2 * len(buffer), 64), 2))
+                newBuffer[:start] = buffer[:start]
+                buffer = self._buffers[series][i] = newBuffer
+
+            newPoints = buffer[start:end]
+            newPoints[:, 0] = x
+            newPoints[:, 1] = values.get(label, np.nan)
+
+            # Matplotlib copies the data it's given, so the artists are only updated before the figure is next drawn,
+            # and only the new points need checking to update the data limits
+            self._staleData.add((series, i))
+            finitePoints = newPoints[np.all(np.isfinite(newPoints), axis=1)]
+            if len(finitePoints) > 0:
+                # Bboxes don't compare by value, so compare their bounds
+                oldBounds = ax.dataLim.bounds
+                ax.update_datalim(finitePoints)
+                if not np.array_equal(ax.dataLim.bounds, oldBounds):
+                    self._staleAxes.add(i)
+
+        self._numPoints[series] = end
+        self._update()
+
+    def draw(self):
+        """Redraw the figure on screen, only redrawing the lines and markers if blitting is possible."""
+        canvas = self.fig.canvas
+        limitsChanged = self._update_artists()
+
+        # The background is also out of date if the figure has been resized, or its dpi changed, since it was captured
+        backgroundValid = self._background is not None and self._backgroundBounds == self.fig.bbox.bounds
+        if self.blit and backgroundValid and not limitsChanged:
+            canvas.restore_region(self._background)
+            self._draw_data_artists()
+            canvas.blit(self.fig.bbox)
+        else:
+            # When blitting, _on_draw captures the background from this draw and draws the lines and markers on top
+            canvas.draw()
+
+        canvas.flush_events()
+        self._lastDraw = time.perf_counter()
+
+    def save(self, filename=None):
+        """Save the figure.
+
+        Parameters
+        ----------
+        filename : str, optional
+            File to save the figure to, by default None, in which case the ``filename`` given when the plots were
+            created is used
+        """
+        filename = filename or self.filename
+        if filename is None:
+            raise ValueError("No file name was given to save the figure to")
+
+        self._update_artists()
+
+        # Animated artists are left out of saved files, and the draw done to save the figure isn't of the screen
+        self._saving = True
+        try:
+            for artist in self._get_data_artists():
+                artist.set_animated(False)
+            _save_stacked_plots(self.fig, filename, self.dpi)
+        finally:
+            for artist in self._get_data_artists():
+                artist.set_animated(self.blit)
+            self._saving = False
+        self._background = None
+
+        self._lastSave = time.perf_counter()
+
+    def close(self):
+        """Save the figure one last time, if it has a file name, and close it."""
+        if self.filename is not None:
+            self.save()
+        plt.close(self.fig)
+
+    def _get_data_artists(self):
+        """Get the lines and markers of every series."""
+        return [artist for seriesArtists in self.lines + self.markers for artist in seriesArtists]
+
+    def _draw_data_artists(self):
+        """Draw the lines and markers on top of whatever the canvas currently holds."""
+        for artist in self._get_data_artists():
+            artist.axes.draw_artist(artist)
+
+    def _on_draw(self, event):
+        """Capture the background to blit onto after a full draw of the figure, then draw the lines and markers."""
+        if self._saving:
+            return
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._backgroundBounds = self.fig.bbox.bounds
+        self._draw_data_artists()
+
+    def _update_artists(self):
+        """Give the lines and markers any data appended since they were last updated, and update the view limits of the
+        axes whose data limits have changed, returning whether there were any."""
+        for series, i in self._staleData:
+            points = self._buffers[series][i][: self._numPoints[series]]
+            self.lines[series][i].set_data(points[:, 0], points[:, 1])
+            if len(self.markers[series]) > 0:
+                self.markers[series][i].set_offsets(points)
+                self.markers[series][i].set_visible(len(points) <= self._maxMarkers)
+        self._staleData.clear()
+
+        for i in self._staleAxes:
+            self.axes[i].autoscale_view()
+        limitsChanged = len(self._staleAxes) > 0
+        self._staleAxes.clear()
+        return limitsChanged
+
+    def _update(self):
+        """Redraw and re-save the figure if enough time has passed since they were last done."""
+        now = time.perf_counter()
+        if self.draw_interval is not None and now - self._lastDraw >= self.draw_interval:
+            self.draw()
+        if self.filename is not None and now - self._lastSave >= self.save_interval:
+            self.save()
+
+
+def get_decimation_indices(x, y, numBins):
+    """Get the indices of the points to keep when reducing the number of points in a line while preserving its shape.
+
+    The x range is split into ``numBins`` equal bins and, within each bin, the first, last, minimum and maximum points
+    are kept. With one bin per pixel column, the decimated line is drawn almost identically to the full one, extrema
+    included. Non-finite y values are always kept, so gaps in the line are preserved.
+
+    Parameters
+    ----------
+    x : array of length n
+        x data, must be sorted in increasing order, otherwise all points are kept
+    y : array of length n
+        y data
+    numBins : int
+        Number of bins to split the x range into
+
+    Returns
+    -------
+    array of int
+        Sorted indices of the points to keep
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    numPoints = len(x)
+
+    # Nothing to gain if there are fewer points than we'd keep, and binning needs sorted x data with a non-zero range
+    if numPoints <= 4 * numBins or not np.all(np.diff(x) >= 0) or not x[-1] > x[0]:
+        return np.arange(numPoints)
+
+    binIndex = np.minimum(((x - x[0]) / (x[-1] - x[0]) * numBins).astype(int), numBins - 1)
+
+    finite = np.flatnonzero(np.isfinite(y))
+    finiteBins = binIndex[finite]
+    firstInBin = np.r_[True, finiteBins[1:] != finiteBins[:-1]]
+    lastInBin = np.r_[finiteBins[1:] != finiteBins[:-1], True]
+
+    # Sorting by bin and then y puts the minimum of each bin first and the maximum last
+    order = finite[np.lexsort((y[finite], finiteBins))]
+    orderBins = binIndex[order]
+    minInBin = np.r_[True, orderBins[1:] != orderBins[:-1]]
+    maxInBin = np.r_[orderBins[1:] != orderBins[:-1], True]
+
+    return np.unique(
+        np.concatenate(
+            [
+                finite[firstInBin],
+                finite[lastInBin],
+                order[minInBin],
+                order[maxInBin],
+                np.flatnonzero(~np.isfinite(y)),
+            ]
+        )
+    )
+
+
+def _get_max_markers(width, markerSize):
+    """Get the number of points spread across a width, in inches, above which markers of a given diameter, in points,
+    start merging into a solid line and are no longer worth drawing."""
+    return width * 72.0 / markerSize
 
 
 def plot_opt_prob(
@@ -558,6 +1320,13 @@ def plot_opt_prob(
     cmap=None,
     levels=None,
     labelAxes=True,
+    adaptive=False,
+    parallel=False,
+    maxWorkers=None,
+    cacheDir=None,
+    vectorized=True,
+    progress=False,
+    optPaths=None,
 ):
     """Generate a contour plot of a 2D constrained optimisation problem
 
@@ -593,6 +1362,42 @@ def plot_opt_prob(
         Number or values of contour lines to plot for the objective function
     labelAxes : bool, optional
         Whether to label the x and y axes, by default True, in which case the axes will be labelled, "$X_1$" and "$X_2$"
+    adaptive : bool or int, optional
+        Whether to sample the functions adaptively, by default False. The functions are first evaluated on a coarse
+        grid, then the cells of the grid that the objective contours or constraint boundaries pass through are
+        repeatedly split in half until they reach the spacing of the full nPoints x nPoints grid. Everywhere else, the
+        function values are interpolated from the corners of the cells that weren't split. This gives the same smooth
+        constraint boundaries with far fewer function evaluations. In this mode the functions are called with 2D
+        arrays containing a single row of points. Pass an integer to set the number of points in each direction of the
+        coarse grid, by default about one eighth of nPoints.
+    parallel : bool or str, optional
+        Whether to evaluate the functions in parallel, by default False. The points are split into chunks, which are
+        evaluated in a pool of processes, or of threads if this is "threads". The functions must be picklable, i.e.
+        defined at the top level of a module, to be evaluated in processes. Threads are only faster for functions that
+        release the GIL, such as ones that spend most of their time in numpy or external code.
+    maxWorkers : int, optional
+        Maximum number of processes or threads to use when evaluating in parallel, by default one per CPU
+    cacheDir : str, optional
+        Directory to cache the evaluated function values in, by default None, in which case nothing is cached. The
+        values of each function are stored in a file keyed by a hash of the function's code, the global variables it
+        uses, and the points it was evaluated at, so re-plotting the same problem with different styles or colors
+        doesn't evaluate the functions again. Neither does changing the levels, unless ``adaptive`` is used, as the
+        points that are refined depend on the levels, so only the coarse grid is reused. Functions that can't be
+        identified by their code alone, such as bound methods, partials, and callable objects, aren't cached.
+    vectorized : bool or str, optional
+        Whether the objective and constraint functions accept arrays, by default True. If False, the functions are
+        instead called with one pair of scalar x and y values at a time, which is faster than wrapping them with
+        ``np.vectorize``, and can be combined with ``parallel`` to spread the calls over several processes. Pass "auto"
+        to check each function by calling it with a pair of points, in which case any function that raises a TypeError
+        or ValueError, as scalar-only code does when given arrays, is called with scalars. Other errors are raised.
+    progress : bool or function, optional
+        Whether to report the progress of evaluating the functions, by default False. Pass a function to have it called
+        as ``progress(numDone, numTotal)`` with the number of points evaluated so far and the total number of points
+        after each chunk of points is evaluated, or True to print the progress. Progress is only reported when
+        evaluating in parallel or when any of the functions only accept scalars.
+    optPaths : array of shape (n, 2), or list of them, optional
+        Path taken by an optimiser, or a list of paths for several runs, to plot with :func:`plot_opt_path`, by default
+        None
 
     Returns
     -------
@@ -602,23 +1407,348 @@ def plot_opt_prob(
         Axis with the colored line. Returned only if no input ax object is specified
     """
 
+    conStyle = _check_con_style(conStyle)
+
     # --- Create a new figure if the user did not supply an ax object ---
     returnFig = False
     if ax is None:
         fig, ax = plt.subplots()
         returnFig = True
 
-    # --- If user provided only single inequality or equality constraint, convert it to an iterable  ---
-    cons = {}
-    for inp, key in zip([eqCon, ineqCon], ["eqCon", "ineqCon"]):
-        if inp is not None:
-            if not hasattr(inp, "__iter__"):
-                cons[key] = [inp]
+    # --- Evaluate objective and constraint functions on a grid of points ---
+    problem = OptProblem(
+        obj,
+        xRange,
+        yRange,
+        ineqCon=ineqCon,
+        eqCon=eqCon,
+        nPoints=nPoints,
+        levels=levels,
+        adaptive=adaptive,
+        parallel=parallel,
+        maxWorkers=maxWorkers,
+        cacheDir=cacheDir,
+        vectorized=vectorized,
+        progress=progress,
+    )
+
+    # --- Plot the objective contours and constraint boundaries ---
+    problem.plot(
+        ax,
+        optPoint=optPoint,
+        conStyle=conStyle,
+        colors=colors,
+        cmap=cmap,
+        levels=levels,
+        labelAxes=labelAxes,
+        optPaths=optPaths,
+    )
+
+    if returnFig:
+        return fig, ax
+    else:
+        return
+
+
+class OptProblem:
+    """A 2D constrained optimisation problem whose objective and constraint functions are evaluated once on a grid of
+    points, so that it can be plotted any number of times, e.g. with different optimiser paths or styles, at the cost
+    of drawing the contours alone. :func:`plot_opt_prob` creates one of these to make its plot.
+
+    Parameters
+    ----------
+    obj : function
+        Objective function, should accept inputs in the form f = obj(x, y) where x and y are 2D arrays
+    xRange : list or array
+        Upper and lower limits of the grid in x
+    yRange : list or array
+        Upper and lower limits of the grid in y
+    ineqCon : function or list of functions, optional
+        Inequality constraint functions of the form g(x, y) <= 0
+    eqCon : functions or list of functions, optional
+        Equality constraint functions of the form h(x, y) == 0
+    nPoints : int, optional
+        Number of points in each direction to evaluate the objective and constraint functions at, by default 51
+    levels : list, array, int, optional
+        Number or values of the objective contour lines that will be plotted, only used to decide where to refine the
+        grid when ``adaptive`` is used
+    adaptive, parallel, maxWorkers, cacheDir, vectorized, progress : optional
+        Control how the functions are evaluated, see :func:`plot_opt_prob`
+
+    Attributes
+    ----------
+    X, Y : 2D arrays
+        Grid of points the functions were evaluated at
+    Fobj : 2D array
+        Objective function values
+    g, h : list of 2D arrays
+        Inequality and equality constraint function values
+    """
+
+    def __init__(
+        self,
+        obj,
+        xRange,
+        yRange,
+        ineqCon=None,
+        eqCon=None,
+        nPoints=51,
+        levels=None,
+        adaptive=False,
+        parallel=False,
+        maxWorkers=None,
+        cacheDir=None,
+        vectorized=True,
+        progress=False,
+    ):
+        # --- If user provided only single inequality or equality constraint, convert it to an iterable  ---
+        cons = {}
+        for inp, key in zip([eqCon, ineqCon], ["eqCon", "ineqCon"]):
+            if inp is not None:
+                if not hasattr(inp, "__iter__"):
+                    cons[key] = [inp]
+                else:
+                    cons[key] = inp
             else:
-                cons[key] = inp
+                cons[key] = []
+
+        self.funcs = [obj] + list(cons["ineqCon"]) + list(cons["eqCon"])
+        self.numIneq = len(cons["ineqCon"])
+        self.levels = levels
+        self.adaptive = adaptive
+        self.parallel = parallel
+        self.maxWorkers = maxWorkers
+        self.cacheDir = cacheDir
+        self.progress = progress
+        self.vectorized = _get_vectorized_flags(self.funcs, vectorized, xRange, yRange)
+
+        self._evaluate(xRange, yRange, nPoints)
+
+    @property
+    def Fobj(self):
+        return self.values[0]
+
+    @property
+    def g(self):
+        return self.values[1 : 1 + self.numIneq]
+
+    @property
+    def h(self):
+        return self.values[1 + self.numIneq :]
+
+    def zoom(self, xRange, yRange, nPoints=None, refine=True):
+        """Create a copy of the problem evaluated on a grid covering a different range, reusing the values already
+        evaluated. Points of the new grid that coincide with points of the current grid take their values, so e.g.
+        halving the range with the same number of points only evaluates the functions at the new points in between.
+
+        Parameters
+        ----------
+        xRange : list or array
+            Upper and lower limits of the new grid in x
+        yRange : list or array
+            Upper and lower limits of the new grid in y
+        nPoints : int, optional
+            Number of points in each direction of the new grid, by default the same as the current grid
+        refine : bool, optional
+            Whether to evaluate the functions at the new points within the range of the current grid, by default True.
+            If False, their values are instead interpolated from the current grid, so the functions are only evaluated
+            outside of it. This is much faster but the zoomed plot is no more detailed than the current one.
+
+        Returns
+        -------
+        OptProblem
+            The zoomed problem
+        """
+        zoomed = copy.copy(self)
+        zoomed._evaluate(xRange, yRange, nPoints or self.nPoints, previous=self, refine=refine)
+        return zoomed
+
+    def plot(
+        self,
+        ax=None,
+        optPoint=None,
+        conStyle="shaded",
+        colors=None,
+        cmap=None,
+        levels=None,
+        labelAxes=True,
+        optPaths=None,
+    ):
+        """Plot the objective contours and constraint boundaries of the problem.
+
+        Parameters
+        ----------
+        ax : matplotlib axes object, optional
+            axes to plot, by default None, in which case a new figure will be created and returned by the function
+        optPoint, conStyle, colors, cmap, levels, labelAxes, optPaths : optional
+            Control how the problem is plotted, see :func:`plot_opt_prob`
+
+        Returns
+        -------
+        fig : matplotlib figure object
+            Figure containing the plot. Returned only if no input ax object is specified
+        ax : matplotlib axes object
+            Axis with the plot. Returned only if no input ax object is specified
+        """
+        conStyle = _check_con_style(conStyle)
+
+        # --- Create a new figure if the user did not supply an ax object ---
+        returnFig = False
+        if ax is None:
+            fig, ax = plt.subplots()
+            returnFig = True
+
+        # --- Define some default values if the user didn't provide them ---
+        if cmap is None:
+            cmap = parula_map
+
+        if colors is None:
+            colors = get_colors_list()
+        nColor = len(colors)
+
+        X, Y = self.X, self.Y
+
+        # --- Plot objective contours ---
+        adjust_spines(ax, outward=True)
+        ax.contour(
+            X,
+            Y,
+            self.Fobj,
+            levels=levels,
+            cmap=cmap,
+        )
+
+        # --- Plot constraint boundaries ---
+        colorIndex = 0
+        for conValue in self.g:
+            contour = ax.contour(X, Y, conValue, levels=[0.0], colors=colors[colorIndex % nColor])
+            if conStyle.lower() == "hashed":
+                try:
+                    # This works for older versions of matplotlib
+                    plt.setp(
+                        contour.collections,
+                        path_effects=[patheffects.withTickedStroke(angle=60, length=2)],
+                    )
+                except AttributeError:
+                    # This works for newer versions of matplotlib
+                    contour.set(path_effects=[patheffects.withTickedStroke(angle=60, length=2)])
+            elif conStyle.lower() == "shaded":
+                ax.contourf(
+                    X,
+                    Y,
+                    conValue,
+                    levels=[0.0, np.inf],
+                    colors=colors[colorIndex % nColor],
+                    alpha=0.4,
+                )
+
+            colorIndex += 1
+
+        for conValue in self.h:
+            ax.contour(X, Y, conValue, levels=[0.0], colors=colors[colorIndex % nColor])
+
+        # --- Plot optimiser paths if provided, beneath the optimal point ---
+        if optPaths is not None:
+            plot_opt_path(optPaths, ax)
+
+        # --- Plot optimal point if provided ---
+        if optPoint is not None:
+            ax.plot(
+                optPoint[0],
+                optPoint[1],
+                "o",
+                color="black",
+                markeredgecolor=ax.get_facecolor(),
+                markersize=10,
+                clip_on=False,
+            )
+
+        # --- Label axes if required ---
+        if labelAxes:
+            ax.set_xlabel("$x_1$")
+            ax.set_ylabel("$x_2$", rotation="horizontal", ha="right")
+
+        if returnFig:
+            return fig, ax
+
+    def _evaluate(self, xRange, yRange, nPoints, previous=None, refine=True):
+        """Evaluate the functions on a grid, taking the values of any points that coincide with points of a previous
+        grid from it, and if ``refine`` is False interpolating the values of the other points within its range."""
+        self.nPoints = nPoints
+        self.X, self.Y = np.meshgrid(
+            np.linspace(xRange[0], xRange[1], nPoints),
+            np.linspace(yRange[0], yRange[1], nPoints),
+        )
+        evalArgs = [self.parallel, self.maxWorkers, self.cacheDir, self.vectorized, self.progress]
+
+        values = np.full((len(self.funcs), nPoints, nPoints), np.nan)
+        evaluated = np.zeros((nPoints, nPoints), dtype=bool)
+        known = evaluated
+        if previous is not None:
+            values, evaluated, known = previous._resample(self.X, self.Y, not refine)
+
+        # Keep track of which points the functions were actually evaluated at, as opposed to interpolated, as only
+        # those can be reused when zooming
+        if self.adaptive:
+            nCoarse = max((nPoints - 1) // 8 + 1, 3) if self.adaptive is True else self.adaptive
+            _, _, self.values, sampled = _sample_opt_prob_adaptive(
+                self.funcs, xRange, yRange, nPoints, nCoarse, self.levels, *evalArgs, values=values, known=known.copy()
+            )
+            self._evaluated = evaluated | (sampled & ~known)
+        elif previous is None:
+            self.values = _evaluate_opt_prob_funcs(self.funcs, self.X, self.Y, *evalArgs)
+            self._evaluated = np.ones((nPoints, nPoints), dtype=bool)
         else:
-            cons[key] = []
+            self._evaluated = evaluated | ~known
+            if not np.all(known):
+                newValues = _evaluate_opt_prob_funcs(
+                    self.funcs, self.X[np.newaxis, ~known], self.Y[np.newaxis, ~known], *evalArgs
+                )
+                for i, result in enumerate(newValues):
+                    values[i, ~known] = np.broadcast_to(result, (1, np.sum(~known)))[0]
+            self.values = list(values)
+
+    def _resample(self, X, Y, interpolate):
+        """Get the values of the functions at the points of a new grid that coincide with points of this one that they
+        were evaluated at and, if ``interpolate`` is True, interpolate them at the other points within its range.
+        Returns the values, a mask of which points have evaluated values, and a mask of which points have values."""
+        x = self.X[0]
+        y = self.Y[:, 0]
+        values = np.stack([np.broadcast_to(value, self.X.shape) for value in self.values])
+
+        # Fractional indices of the new points in this grid
+        colIndex = (X - x[0]) / (x[-1] - x[0]) * (len(x) - 1)
+        rowIndex = (Y - y[0]) / (y[-1] - y[0]) * (len(y) - 1)
+        inRange = (colIndex >= 0) & (colIndex <= len(x) - 1) & (rowIndex >= 0) & (rowIndex <= len(y) - 1)
+
+        col = np.clip(np.rint(colIndex).astype(int), 0, len(x) - 1)
+        row = np.clip(np.rint(rowIndex).astype(int), 0, len(y) - 1)
+        onGrid = (
+            inRange & np.isclose(colIndex, col, rtol=0.0, atol=1e-8) & np.isclose(rowIndex, row, rtol=0.0, atol=1e-8)
+        )
+
+        # Interpolated values of an adaptively sampled grid aren't exact, so they aren't reused as they are
+        evaluated = onGrid & self._evaluated[row, col]
+        newValues = np.full((len(values),) + X.shape, np.nan)
+        newValues[:, evaluated] = values[:, row[evaluated], col[evaluated]]
+        known = evaluated
+
+        if interpolate:
+            fill = inRange & ~evaluated
+            col0 = np.clip(np.floor(colIndex[fill]).astype(int), 0, len(x) - 2)
+            row0 = np.clip(np.floor(rowIndex[fill]).astype(int), 0, len(y) - 2)
+            t = colIndex[fill] - col0
+            u = rowIndex[fill] - row0
+            newValues[:, fill] = (1 - u) * ((1 - t) * values[:, row0, col0] + t * values[:, row0, col0 + 1]) + u * (
+                (1 - t) * values[:, row0 + 1, col0] + t * values[:, row0 + 1, col0 + 1]
+            )
+            known = known | fill
+
+        return newValues, evaluated, known
 
+
+def _check_con_style(conStyle):
+    """Check that a plot_opt_prob conStyle is supported, returning the style to use."""
     # --- Check that conStyle contains a supported value to avoid random conStyle arguments ---
     if conStyle.lower() not in ["shaded", "hashed"]:
         raise ValueError(f"conStyle: {conStyle} is not supported")
@@ -628,95 +1758,470 @@ def plot_opt_prob(
         if not hasattr(patheffects, "withTickedStroke"):
             warnings.warn(
                 "matplotlib >= 3.4 is required for hashed inequality constrain boundaries, switching to shaded inequality constraint style",
-                stacklevel=2,
+                stacklevel=3,
             )
             conStyle = "shaded"
 
-    # --- Define some default values if the user didn't provide them ---
-    if cmap is None:
-        cmap = parula_map
+    return conStyle
+
+
+def plot_opt_path(
+    paths,
+    ax=None,
+    colors=None,
+    colorByIteration=False,
+    cmap=None,
+    addColorBar=False,
+    cBarLabel="Iteration",
+    decimate=True,
+    markers=None,
+    rasterized=None,
+    **kwargs,
+):
+    """Plot the paths taken by one or more runs of an optimiser, e.g. on top of a plot from :func:`plot_opt_prob`.
+
+    Each run is drawn as a single artist, however many iterations it has, or when coloring by iteration all of the runs
+    are drawn as a single line collection, so long iteration histories can be plotted quickly.
+
+    Parameters
+    ----------
+    paths : array of shape (n, 2), or list of them
+        Design variable values at each iteration of a run, or a list of these for several runs
+    ax : matplotlib axes object, optional
+        axes to plot on, by default None, in which case a new figure will be created and returned by the function
+    colors : list, optional
+        Colors to use for each run, by default the axis color if there is a single run or the current style's colors if
+        there are several
+    colorByIteration : bool, optional
+        Whether to color the paths by iteration number using :func:`plot_colored_line`, by default False, in which case
+        ``colors`` are used. All runs share the same colormap range.
+    cmap : str or matplotlib colormap, optional
+        Colormap to use when coloring by iteration, by default will use nicePlots' parula map
+    addColorBar : bool, optional
+        Whether to add a colorbar when coloring by iteration, by default False
+    cBarLabel : str, optional
+        Label for the colorbar, by default "Iteration"
+    decimate : bool or float, optional
+        Whether to leave out iterations that would be drawn within a pixel of the previous point drawn, by default True.
+        This makes no visible difference to the path but makes paths with many iterations much faster to draw. Pass a
+        float to set the distance, in pixels, within which points are left out.
+    markers : bool, optional
+        Whether to draw a marker at each iteration, by default None, in which case markers are only drawn on paths
+        with few enough points for the markers to be told apart
+    rasterized : bool, optional
+        Whether to draw the paths as images embedded in vector outputs, see :func:`plot_colored_line`, by default None,
+        in which case paths with more than ``RASTERIZE_THRESHOLD`` segments are rasterized
+    **kwargs :
+        Any other keyword arguments are passed to matplotlib's ``plot``, or to :func:`plot_colored_line` when coloring
+        by iteration
+
+    Returns
+    -------
+    fig : matplotlib figure object
+        Figure containing the plot. Returned only if no input ax object is specified
+    ax : matplotlib axes object
+        Axis with the paths. Returned only if no input ax object is specified
+    """
+    returnFig = False
+    if ax is None:
+        fig, ax = plt.subplots()
+        returnFig = True
+
+    # --- If the user provided a single path, convert it to a list ---
+    if len(paths) > 0 and np.ndim(paths[0]) == 1:
+        paths = [paths]
+    paths = [np.asarray(path, dtype=float).reshape(-1, 2) for path in paths]
 
     if colors is None:
-        colors = get_colors_list()
-    nColor = len(colors)
+        colors = [plt.rcParams["axes.edgecolor"]] if len(paths) == 1 else get_colors_list()
+    if cmap is None:
+        cmap = parula_map
+    kwargs.setdefault("linewidth", 2.0)
+    kwargs.setdefault("clip_on", False)
 
-    # --- Create grid of points for evaluating functions ---
-    X, Y = np.meshgrid(
-        np.linspace(xRange[0], xRange[1], nPoints),
-        np.linspace(yRange[0], yRange[1], nPoints),
-    )
+    pixelSize = _get_pixel_size(ax, np.concatenate(paths) if len(paths) > 0 else np.empty((0, 2)))
 
-    # --- Evaluate objective and constraint functions ---
-    Fobj = obj(X, Y)
-    g = []
-    for ineq in cons["ineqCon"]:
-        g.append(ineq(X, Y))
-    h = []
-    for eq in cons["eqCon"]:
-        h.append(eq(X, Y))
-
-    # --- Plot objective contours ---
-    adjust_spines(ax, outward=True)
-    ax.contour(
-        X,
-        Y,
-        Fobj,
-        levels=levels,
-        cmap=cmap,
-    )
+    maxMarkers = _get_max_markers(ax.bbox.width / ax.figure.dpi, 8.0)
 
-    # --- Plot constraint boundaries ---
-    colorIndex = 0
-    for conValue in g:
-        contour = ax.contour(X, Y, conValue, levels=[0.0], colors=colors[colorIndex % nColor])
-        if conStyle.lower() == "hashed":
-            try:
-                # This works for older versions of matplotlib
-                plt.setp(
-                    contour.collections,
-                    path_effects=[patheffects.withTickedStroke(angle=60, length=2)],
+    norm = plt.Normalize(0, max([len(path) for path in paths], default=1) - 1)
+    coloredLines = []
+    for i, path in enumerate(paths):
+        if len(path) == 0:
+            continue
+        iterations = np.arange(len(path))
+        if decimate:
+            keep = _get_path_decimation_indices(path, pixelSize * float(decimate))
+            path = path[keep]
+            iterations = iterations[keep]
+
+        showMarkers = len(path) <= maxMarkers if markers is None else markers
+        rasterizePath = _use_rasterization(rasterized, len(path) - 1)
+        if colorByIteration:
+            # The lines of all the runs are drawn together afterwards
+            coloredLines.append((path[:, 0], path[:, 1], iterations))
+            if showMarkers:
+                ax.scatter(
+                    path[:, 0],
+                    path[:, 1],
+                    c=iterations,
+                    cmap=cmap,
+                    norm=norm,
+                    edgecolors=ax.get_facecolor(),
+                    s=64,
+                    zorder=3,
+                    clip_on=kwargs["clip_on"],
+                    rasterized=rasterizePath,
                 )
-            except AttributeError:
-                # This works for newer versions of matplotlib
-                contour.set(path_effects=[patheffects.withTickedStroke(angle=60, length=2)])
-        elif conStyle.lower() == "shaded":
-            ax.contourf(
-                X,
-                Y,
-                conValue,
-                levels=[0.0, np.inf],
-                colors=colors[colorIndex % nColor],
-                alpha=0.4,
+        else:
+            ax.plot(
+                path[:, 0],
+                path[:, 1],
+                "-o" if showMarkers else "-",
+                color=colors[i % len(colors)],
+                markeredgecolor=ax.get_facecolor(),
+                markersize=8,
+                rasterized=rasterizePath,
+                **kwargs,
             )
 
-        colorIndex += 1
-
-    for conValue in h:
-        ax.contour(X, Y, conValue, levels=[0.0], colors=colors[colorIndex % nColor])
-
-    # --- Plot optimal point if provided ---
-    if optPoint is not None:
-        ax.plot(
-            optPoint[0],
-            optPoint[1],
-            "o",
-            color="black",
-            markeredgecolor=ax.get_facecolor(),
-            markersize=10,
-            clip_on=False,
+    if colorByIteration and len(coloredLines) > 0:
+        plot_colored_lines(
+            coloredLines,
+            cmap=cmap,
+            fig=ax.figure,
+            ax=ax,
+            addColorBar=addColorBar,
+            cBarLabel=cBarLabel,
+            norm=norm,
+            rasterized=rasterized,
+            **kwargs,
         )
 
-    # --- Label axes if required ---
-    if labelAxes:
-        ax.set_xlabel("$x_1$")
-        ax.set_ylabel("$x_2$", rotation="horizontal", ha="right")
-
     if returnFig:
         return fig, ax
     else:
         return
 
 
+def _get_pixel_size(ax, points):
+    """Get the size of a pixel of an axes in data units, in x and y, from the range of some points that are about to
+    be plotted on it and of anything already on it. The size is zero if there is nothing finite to go by."""
+    points = points[np.all(np.isfinite(points), axis=1)]
+    lower, upper = points.min(axis=0, initial=np.inf), points.max(axis=0, initial=-np.inf)
+    if ax.has_data():
+        lower = np.minimum(lower, [ax.get_xlim()[0], ax.get_ylim()[0]])
+        upper = np.maximum(upper, [ax.get_xlim()[1], ax.get_ylim()[1]])
+    if not np.all(upper >= lower):
+        return np.zeros(2)
+    return (upper - lower) / [ax.bbox.width, ax.bbox.height]
+
+
+def _get_path_decimation_indices(path, pixelSize):
+    """Get the indices of the points of a path to keep, leaving out points within a pixel, in both directions, of the
+    last point kept. The last point, and any non-finite points, are always kept."""
+    if len(path) == 0:
+        return np.zeros(0, dtype=int)
+    scaled = path / np.where(pixelSize > 0, pixelSize, 1.0)
+
+    # First cheaply leave out points in the same pixel as the point before them, as long paths usually have many
+    cells = np.floor(scaled)
+    candidates = np.flatnonzero(np.concatenate([[True], np.any(cells[1:] != cells[:-1], axis=1)]))
+
+    keep = [0]
+    xLast, yLast = scaled[0]
+    # This has to be done point by point, as whether a point is kept depends on which of the previous ones were
+    for i, (x, y) in zip(candidates[1:].tolist(), scaled[candidates[1:]].tolist()):
+        if not abs(x - xLast) < 1.0 or not abs(y - yLast) < 1.0:
+            keep.append(i)
+            xLast, yLast = x, y
+    if len(path) > 1 and keep[-1] != len(path) - 1:
+        keep.append(len(path) - 1)
+    return np.array(keep)
+
+
+def _evaluate_opt_prob_funcs(
+    funcs, X, Y, parallel=False, maxWorkers=None, cacheDir=None, vectorized=None, progress=None
+):
+    """Evaluate the objective and constraint functions of plot_opt_prob at a set of points, optionally in parallel and
+    reusing the values cached from previous evaluations at the same points. ``vectorized`` is a list of whether each
+    function accepts arrays, by default they all do."""
+    if vectorized is None:
+        vectorized = [True] * len(funcs)
+
+    results = [None] * len(funcs)
+    cachePaths = [None] * len(funcs)
+    if cacheDir is not None:
+        for i, func in enumerate(funcs):
+            # Unlike get_plot_hash, the style isn't included in the key, as it doesn't change the function values
+            hasher = hashlib.sha256()
+            try:
+                _update_hash(hasher, [func, X, Y])
+            except _UnstableHashError as e:
+                warnings.warn(f"Not caching the function values, {e}", stacklevel=2)
+                continue
+            cachePaths[i] = os.path.join(cacheDir, f"{hasher.hexdigest()}.npy")
+            try:
+                results[i] = np.load(cachePaths[i])
+            except (OSError, ValueError):
+                pass
+
+    toEvaluate = [i for i, result in enumerate(results) if result is None]
+    if len(toEvaluate) == 0:
+        return results
+
+    evalFuncs = [funcs[i] for i in toEvaluate]
+    evalVectorized = [vectorized[i] for i in toEvaluate]
+    if parallel or (progress and not all(evalVectorized)):
+        newResults = _call_funcs_chunked(evalFuncs, evalVectorized, X, Y, parallel, maxWorkers, progress)
+    else:
+        newResults = _call_funcs(evalFuncs, evalVectorized, X, Y)
+
+    for i, result in zip(toEvaluate, newResults):
+        results[i] = result
+        if cachePaths[i] is not None:
+            _write_cached_values(cachePaths[i], result)
+
+    return results
+
+
+def _get_vectorized_flags(funcs, vectorized, xRange, yRange):
+    """Work out whether each of the plot_opt_prob functions accepts arrays. When ``vectorized`` is "auto", each function
+    is tried on a pair of points, and any function that raises the TypeError or ValueError that scalar-only code raises
+    when given arrays (e.g. from ``math.sin`` or ``if x > 0``), or doesn't return a value per point, is taken to only
+    accept scalars. Any other error is a bug in the function, so it's raised."""
+    if vectorized != "auto":
+        return [bool(vectorized)] * len(funcs)
+
+    xTest = np.array([[xRange[0], xRange[1]]], dtype=float)
+    yTest = np.array([[yRange[0], yRange[1]]], dtype=float)
+    flags = []
+    for func in funcs:
+        try:
+            np.broadcast_to(func(xTest, yTest), xTest.shape)
+            flags.append(True)
+        except (TypeError, ValueError):
+            flags.append(False)
+    return flags
+
+
+def _call_funcs(funcs, vectorized, X, Y):
+    """Call several functions with the same inputs, also used to evaluate chunks of points in worker processes.
+    Functions that only accept scalars are called once per point."""
+    results = []
+    xPoints = yPoints = None
+    for func, isVectorized in zip(funcs, vectorized):
+        if isVectorized:
+            results.append(func(X, Y))
+        else:
+            if xPoints is None:
+                xPoints, yPoints = X.ravel().tolist(), Y.ravel().tolist()
+            values = np.fromiter((func(x, y) for x, y in zip(xPoints, yPoints)), dtype=float, count=len(xPoints))
+            results.append(values.reshape(X.shape))
+    return results
+
+
+def _call_funcs_chunked(funcs, vectorized, X, Y, parallel, maxWorkers, progress):
+    """Call several functions of x and y with the points split into chunks. The chunks are evaluated in a pool of
+    processes if ``parallel`` is True, of threads if it is "threads", and in turn otherwise. ``progress`` is called with
+    the number of points evaluated so far and the total number of points after each chunk, or if it is True the
+    progress is printed."""
+    # Split whole rows of the grid between the chunks, unless there's only one row
+    axis = 0 if X.shape[0] > 1 else 1
+    numWorkers = (maxWorkers or os.cpu_count() or 1) if parallel else 1
+    numChunks = min(4 * numWorkers if parallel else 20, X.shape[axis])
+    xChunks = np.array_split(X, numChunks, axis=axis)
+    yChunks = np.array_split(Y, numChunks, axis=axis)
+
+    if progress is True:
+        progress = _print_progress
+
+    chunkResults = [None] * numChunks
+    numDone = 0
+
+    def chunkDone(i, result):
+        nonlocal numDone
+        chunkResults[i] = result
+        numDone += xChunks[i].size
+        if progress:
+            progress(numDone, X.size)
+
+    if parallel:
+        executorType = ThreadPoolExecutor if parallel == "threads" else ProcessPoolExecutor
+        with executorType(max_workers=numWorkers) as executor:
+            futures = {
+                executor.submit(_call_funcs, funcs, vectorized, xChunk, yChunk): i
+                for i, (xChunk, yChunk) in enumerate(zip(xChunks, yChunks))
+            }
+            for future in as_completed(futures):
+                chunkDone(futures[future], future.result())
+    else:
+        for i, (xChunk, yChunk) in enumerate(zip(xChunks, yChunks)):
+            chunkDone(i, _call_funcs(funcs, vectorized, xChunk, yChunk))
+
+    # Functions can return constants, so broadcast each chunk's result to the chunk's shape before joining them
+    return [
+        np.concatenate(
+            [np.broadcast_to(result[i], xChunk.shape) for result, xChunk in zip(chunkResults, xChunks)], axis=axis
+        )
+        for i in range(len(funcs))
+    ]
+
+
+def _print_progress(numDone, numTotal):
+    """Print the progress of evaluating the plot_opt_prob functions, overwriting the previous progress line."""
+    print(f"\rEvaluated {numDone}/{numTotal} points", end="\n" if numDone == numTotal else "", flush=True)
+
+
+def _write_cached_values(cachePath, values):
+    """Save evaluated function values to the cache. Failing to write them isn't fatal, they'll just be evaluated again
+    next time."""
+    try:
+        os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+        # Write to a temporary file first so a partially written file is never read back
+        tmpPath = _get_temp_file_path(os.path.splitext(cachePath)[0], "npy")
+        np.save(tmpPath, np.asarray(values))
+        os.replace(tmpPath, cachePath)
+    except OSError:
+        pass
+
+
+def _get_contour_levels(levels, values):
+    """Get the values of the contour levels matplotlib will draw for some data, given the levels argument of
+    contour."""
+    if np.iterable(levels):
+        return np.sort(np.asarray(levels, dtype=float))
+
+    finiteValues = values[np.isfinite(values)]
+    if len(finiteValues) == 0:
+        return np.array([])
+
+    # This is what matplotlib's contour does when given a number of levels, or none
+    numLevels = 7 if levels is None else levels
+    return MaxNLocator(numLevels + 1).tick_values(finiteValues.min(), finiteValues.max())
+
+
+def _sample_opt_prob_adaptive(
+    funcs,
+    xRange,
+    yRange,
+    nPoints,
+    nCoarse,
+    levels,
+    parallel=False,
+    maxWorkers=None,
+    cacheDir=None,
+    vectorized=None,
+    progress=None,
+    values=None,
+    known=None,
+):
+    """Evaluate the objective and constraint functions of plot_opt_prob on an nPoints x nPoints grid by refining a
+    coarse grid only where the objective contours or the constraint boundaries pass, and interpolating elsewhere.
+
+    The first function is taken to be the objective, whose contour levels are found from its values on the coarse
+    grid, and the rest the constraints, whose boundaries are where they are zero. Cells of the grid with corners
+    either side of a contour level or a boundary, or with non-finite corner values, are split in half in each
+    direction until they reach the spacing of the full grid. ``values`` and ``known`` can give the function values
+    already known at some points of the grid, which aren't evaluated again.
+
+    Returns
+    -------
+    X, Y : 2D arrays
+        Full grid of points
+    values : list of 2D arrays
+        Values of each function on the full grid
+    known : 2D array of bool
+        Which points of the grid the functions were evaluated at, or whose values were already known, as opposed to
+        interpolated
+    """
+    X, Y = np.meshgrid(
+        np.linspace(xRange[0], xRange[1], nPoints),
+        np.linspace(yRange[0], yRange[1], nPoints),
+    )
+    if values is None:
+        values = np.full((len(funcs), nPoints, nPoints), np.nan)
+        known = np.zeros((nPoints, nPoints), dtype=bool)
+
+    def evaluate(rows, cols):
+        points = np.unique(rows * nPoints + cols)
+        rows, cols = np.divmod(points, nPoints)
+        new = ~known[rows, cols]
+        rows, cols = rows[new], cols[new]
+        if len(rows) > 0:
+            # The functions expect 2D arrays, so pass the points as a single row
+            results = _evaluate_opt_prob_funcs(
+                funcs,
+                X[np.newaxis, rows, cols],
+                Y[np.newaxis, rows, cols],
+                parallel,
+                maxWorkers,
+                cacheDir,
+                vectorized,
+                progress,
+            )
+            for i, result in enumerate(results):
+                values[i, rows, cols] = np.broadcast_to(result, (1, len(rows)))[0]
+            known[rows, cols] = True
+
+    # --- Evaluate the coarse grid, the cells are stored as the grid indices of their corners ---
+    coarse = np.unique(np.linspace(0, nPoints - 1, nCoarse).round().astype(int))
+    rows, cols = np.meshgrid(coarse, coarse, indexing="ij")
+    evaluate(rows.ravel(), cols.ravel())
+
+    i0, j0 = [index.ravel() for index in np.meshgrid(coarse[:-1], coarse[:-1], indexing="ij")]
+    i1, j1 = [index.ravel() for index in np.meshgrid(coarse[1:], coarse[1:], indexing="ij")]
+    objLevels = _get_contour_levels(levels, values[0])
+
+    # --- Split the cells that need refining until they can't be split any further ---
+    leaves = []
+    while len(i0) > 0:
+        cornerValues = values[:, [i0, i0, i1, i1], [j0, j1, j0, j1]]
+        minValues = cornerValues.min(axis=1)
+        maxValues = cornerValues.max(axis=1)
+
+        refine = ~np.all(np.isfinite(cornerValues), axis=(0, 1))
+        refine |= np.searchsorted(objLevels, minValues[0], "left") != np.searchsorted(objLevels, maxValues[0], "right")
+        refine |= np.any((minValues[1:] <= 0.0) & (maxValues[1:] >= 0.0), axis=0)
+        refine &= (i1 - i0 > 1) | (j1 - j0 > 1)
+
+        leaves.append((i0[~refine], i1[~refine], j0[~refine], j1[~refine]))
+        i0, i1, j0, j1 = i0[refine], i1[refine], j0[refine], j1[refine]
+
+        # Cells only one grid spacing wide in a direction aren't split in that direction
+        iMid = (i0 + i1) // 2
+        jMid = (j0 + j1) // 2
+        children = [[], [], [], []]
+        for iStart, iEnd in [(i0, iMid), (iMid, i1)]:
+            for jStart, jEnd in [(j0, jMid), (jMid, j1)]:
+                valid = (iEnd > iStart) & (jEnd > jStart)
+                for child, index in zip(children, [iStart, iEnd, jStart, jEnd]):
+                    child.append(index[valid])
+        i0, i1, j0, j1 = [np.concatenate(child) for child in children]
+        evaluate(np.concatenate([i0, i0, i1, i1]), np.concatenate([j0, j1, j0, j1]))
+
+    # --- Interpolate the points that weren't evaluated from the corners of the cells they lie in ---
+    # Larger cells are filled first so that, on edges shared with smaller cells, the more accurate values are kept
+    i0, i1, j0, j1 = [np.concatenate(leaf) for leaf in zip(*leaves)]
+    cellSizes = np.stack([i1 - i0, j1 - j0], axis=1)
+    for di, dj in sorted(set(map(tuple, cellSizes)), key=lambda size: -size[0] * size[1]):
+        if di == 1 and dj == 1:
+            continue
+        inGroup = np.flatnonzero((cellSizes[:, 0] == di) & (cellSizes[:, 1] == dj))
+        iOffset, jOffset = np.meshgrid(np.arange(di + 1), np.arange(dj + 1), indexing="ij")
+        rows = i0[inGroup, np.newaxis, np.newaxis] + iOffset
+        cols = j0[inGroup, np.newaxis, np.newaxis] + jOffset
+        fill = ~known[rows, cols]
+        t = (iOffset / di)[np.newaxis]
+        u = (jOffset / dj)[np.newaxis]
+        corners = [values[:, i0[inGroup], j0[inGroup]], values[:, i0[inGroup], j1[inGroup]]]
+        corners += [values[:, i1[inGroup], j0[inGroup]], values[:, i1[inGroup], j1[inGroup]]]
+        v00, v01, v10, v11 = [corner[:, :, np.newaxis, np.newaxis] for corner in corners]
+        interpValues = (1 - t) * ((1 - u) * v00 + u * v01) + t * ((1 - u) * v10 + u * v11)
+        values[:, rows[fill], cols[fill]] = interpValues[:, fill]
+
+    return X, Y, list(values), known.copy()
+
+
 def plot_colored_line(
     x,
     y,
@@ -728,6 +2233,9 @@ def plot_colored_line(
     cRange=None,
     cBarLabel=None,
     norm=None,
+    mergeColors=False,
+    decimate=False,
+    rasterized=None,
     **kwargs,
 ):
     """Plot an XY line whose color is determined by some other variable C
@@ -754,6 +2262,19 @@ def plot_colored_line(
         Label for the colormap, by default None
     norm : matplotlib.colors.Normalize, optional
         Specify colormap mapping; both this and cRange cannot be specified, it must be one or the other (or neither)
+    mergeColors : bool or int, optional
+        Whether to join consecutive segments of the line whose colors fall in the same bin of the colormap into a single
+        polyline, by default False. This draws lines with many points much faster, since matplotlib draws each
+        segment of the line as a separate path, and smooth color variations can't be told apart from the full line.
+        Pass True to use one bin per color in the colormap, or an integer number of bins.
+    decimate : bool or float, optional
+        Whether to leave out points that would be drawn within a pixel of the previous point drawn, by default False.
+        Pass a float to set the distance, in pixels, within which points are left out.
+    rasterized : bool, optional
+        Whether to draw the line as an image embedded in vector outputs such as pdf and svg files, at the resolution
+        the figure is saved at, while the axes, labels, and colorbar stay as vectors, by default None, in which case
+        the line is rasterized if it has more than ``RASTERIZE_THRESHOLD`` segments. Vector files of lines with many
+        segments are otherwise very large and slow to open. This has no effect on raster outputs like png files.
 
     Returns
     -------
@@ -762,35 +2283,124 @@ def plot_colored_line(
     ax : matplotlib axes object
         Axis with the colored line. Returned only if no input ax object is specified
     """
+    return plot_colored_lines(
+        [(x, y, c)],
+        cmap=cmap,
+        fig=fig,
+        ax=ax,
+        addColorBar=addColorBar,
+        cRange=cRange,
+        cBarLabel=cBarLabel,
+        norm=norm,
+        mergeColors=mergeColors,
+        decimate=decimate,
+        rasterized=rasterized,
+        **kwargs,
+    )
+
+
+def plot_colored_lines(
+    lines,
+    cmap=None,
+    fig=None,
+    ax=None,
+    addColorBar=False,
+    cRange=None,
+    cBarLabel=None,
+    norm=None,
+    mergeColors=False,
+    decimate=False,
+    rasterized=None,
+    **kwargs,
+):
+    """Plot many XY lines whose colors are determined by some other variable C, e.g. the trajectories of many runs of
+    an optimiser. All of the lines share the same colormap range and are drawn as a single line collection, which is
+    much faster than calling :func:`plot_colored_line` for each line.
+
+    Parameters
+    ----------
+    lines : list of tuples of 3 iterables
+        The x, y, and c data of each line, see :func:`plot_colored_line`, the lines can be of different lengths
+    cmap, fig, ax, addColorBar, cRange, cBarLabel, norm, mergeColors, decimate : optional
+        See :func:`plot_colored_line`. If neither ``cRange`` nor ``norm`` is given, the colormap spans the c values of
+        all of the lines.
+    rasterized : bool, optional
+        See :func:`plot_colored_line`, by default None, in which case the lines are rasterized if they have more than
+        ``RASTERIZE_THRESHOLD`` segments in total
+
+    Returns
+    -------
+    fig : matplotlib figure object
+        Figure containing the plot. Returned only if no input ax object is specified
+    ax : matplotlib axes object
+        Axis with the colored lines. Returned only if no input ax object is specified
+    """
+    if len(lines) == 0:
+        raise ValueError("At least one line must be given to plot_colored_lines")
+
     returnFig = False
-    if ax is None or fig is None:
+    if ax is None:
         fig, ax = plt.subplots()
         returnFig = True
+    elif fig is None:
+        fig = ax.figure
 
     if cmap is None:
         cmap = parula_map
 
-    # --- Convert inputs to flattened arrays ---
-    data = {}
-    for d, name in zip([x, y, c], ["x", "y", "c"]):
-        if not isinstance(d, np.ndarray):
-            data[name] = np.array(d)
-        else:
-            data[name] = d
-        data[name] = data[name].flatten()
-
-    # --- Create points and segments ---
-    points = np.array([data["x"], data["y"]]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    # --- Convert inputs to flattened arrays, without copying them if they already are ---
+    points = []
+    cValues = []
+    for x, y, c in lines:
+        points.append(np.column_stack([np.ravel(np.asarray(x)), np.ravel(np.asarray(y))]))
+        cValues.append(np.ravel(np.asarray(c)))
 
     if cRange is not None and norm is not None:
         raise ValueError("cRange and norm cannot both be specified")
     if cRange is not None:
         norm = plt.Normalize(cRange[0], cRange[1])
+
+    if decimate:
+        pixelSize = _get_pixel_size(ax, np.concatenate(points)) * float(decimate)
+        keeps = [_get_path_decimation_indices(linePoints, pixelSize) for linePoints in points]
+        points = [linePoints[keep] for linePoints, keep in zip(points, keeps)]
+        cValues = [c[keep] for c, keep in zip(cValues, keeps)]
+
+    # The lines share one norm, which merging also bins the colors with, so it's fixed from all of the data up front
+    allC = np.concatenate(cValues)
+    finiteC = allC[np.isfinite(allC)]
+    if norm is None:
+        norm = plt.Normalize(finiteC.min(), finiteC.max()) if len(finiteC) > 0 else plt.Normalize()
+
+    # --- Create the segments of every line, each colored by the value at its first point ---
+    segments = []
+    segmentC = []
+    for linePoints, c in zip(points, cValues):
+        if len(linePoints) < 2:
+            continue
+        if mergeColors:
+            numBins = plt.get_cmap(cmap).N if mergeColors is True else int(mergeColors)
+            lineSegments, lineC = _merge_colored_segments(linePoints, c, norm, numBins)
+        else:
+            # Each segment is a view of two consecutive points, so the points aren't copied
+            lineSegments = np.lib.stride_tricks.sliding_window_view(linePoints, 2, axis=0).transpose(0, 2, 1)
+            lineC = c[: len(linePoints) - 1]
+        segments.append(lineSegments)
+        segmentC.append(lineC)
+
+    if mergeColors:
+        segments = [segment for lineSegments in segments for segment in lineSegments]
+    elif len(segments) == 1:
+        segments = segments[0]
+    else:
+        segments = np.concatenate(segments) if len(segments) > 0 else np.empty((0, 2, 2))
+    segmentC = np.concatenate(segmentC) if len(segmentC) > 0 else np.empty(0)
+
     lc = LineCollection(segments, cmap=cmap, norm=norm, **kwargs)
+    lc.set_rasterized(_use_rasterization(rasterized, len(segments)))
 
     # Set the values used for colormapping
-    lc.set_array(data["c"])
+    lc.set_array(segmentC)
     line = ax.add_collection(lc)
     if addColorBar:
         cBar = fig.colorbar(line, ax=ax)
@@ -805,6 +2415,28 @@ def plot_colored_line(
         return
 
 
+def _use_rasterization(rasterized, numSegments):
+    """Work out whether to rasterize a line, rasterizing lines with more than RASTERIZE_THRESHOLD segments unless told
+    otherwise."""
+    if rasterized is None:
+        return numSegments > RASTERIZE_THRESHOLD
+    return rasterized
+
+
+def _merge_colored_segments(points, c, norm, numBins):
+    """Join consecutive segments of a colored line whose colors fall in the same colormap bin into polylines, each
+    colored by the value of its first segment. Returns the polylines, which are views of ``points``, and their color
+    values."""
+    # Each segment is colored by the value at its first point, non-finite and out of range values get their own bins
+    segmentC = c[:-1]
+    scaled = np.ma.filled(np.ma.asarray(norm(segmentC), dtype=float), np.nan)
+    bins = np.where(np.isfinite(scaled), np.clip(np.floor(scaled * numBins), -1, numBins), -2)
+
+    runStarts = np.flatnonzero(np.concatenate([[True], bins[1:] != bins[:-1]]))
+    runEnds = np.append(runStarts[1:], len(segmentC))
+    return [points[start : end + 1] for start, end in zip(runStarts, runEnds)], segmentC[runStarts]
+
+
 def plot_nested_pie(
     data,
     colors=None,
@@ -812,9 +2444,13 @@ def plot_nested_pie(
     ax=None,
     innerKwargs=None,
     outerKwargs=None,
+    minFraction=0.0,
+    minLabelFraction=0.0,
+    otherLabel="Other",
 ):
     """Create a two-level pie chart where the inner pie chart is a sum of related categories from the outer one.
-    The labels are by default set to the keys in the data dictionary.
+    The labels are by default set to the keys in the data dictionary. Subcategories can themselves be dicts of
+    subcategories, in which case another ring is added for each extra level to make a sunburst chart.
 
     Parameters
     ----------
@@ -832,13 +2468,15 @@ def plot_nested_pie(
                 ...
             }
 
-    colors : str or list of str with hex colors, optional
+        The hierarchy can be any number of levels deep and doesn't need to be the same depth everywhere, the wedges of
+        a subcategory that is shallower than the rest are left empty in the outer rings.
+    colors : str or list of colors, optional
         Colors to use for the inner wedges. Can either specify a qualitative matplotlib colormap (it will assume
-        this is the case if a string is specified), or a list of colors specified with hex codes (e.g., "#F4A103"),
-        by default will use nice colors (niceplots default). Loops through the colors if more categories than
-        colors are specified.
+        this is the case if a string is specified), or a list of matplotlib colors (e.g., "#F4A103"), by default
+        will use nice colors (niceplots default). Loops through the colors if more categories than colors are
+        specified. Any transparency in the colors is ignored.
     alphas : iterable of floats at least as long as the max number of subcategories for a given category
-        Transparencies to use to vary the color in the outer categories
+        Transparencies to use to vary the color in the outer categories, by default evenly spaced between 0.9 and 0.5
     ax : matplotlib axes object, optional
         axes to plot on, by default None, in which case a new figure will be created and returned by the function
     innerKwargs : dict
@@ -850,7 +2488,19 @@ def plot_nested_pie(
         Dictionary of keyword arguments to pass to matplotlib.pyplot.pie for the outer pie chart. "color" and "radius"
         are important ones for the nested pie chart and I recommend not touching those unless you know what you're
         doing. labels, rotatelabels, wedgeprops, and textprops are also all set by default in this function, but
-        can be overridden using this parameter
+        can be overridden using this parameter. For deeper hierarchies these are used for every ring outside the
+        inner one
+    minFraction : float, optional
+        Subcategories that take up less than this fraction of the whole pie are combined into a single wedge per
+        category, labelled with otherLabel, by default 0.0. Only subcategories that aren't dicts themselves are
+        combined and nothing is combined in a category with fewer than two of them. This keeps a chart with
+        thousands of slivers too thin to see fast to draw.
+    minLabelFraction : float, optional
+        Wedges that take up less than this fraction of the whole pie aren't labelled, by default 0.0. No text object
+        is created for them and their "text" in the returned pieObjects is None.
+    otherLabel : str, optional
+        Label of the wedges that combine the subcategories smaller than minFraction, by default "Other". If a category
+        already has a subcategory with this label, the small subcategories are added to it.
 
     Returns
     -------
@@ -872,62 +2522,47 @@ def plot_nested_pie(
                 ...
             }
 
+        Subcategories that are dicts themselves contain the objects for their own subcategories in the same way.
+        Subcategories combined because they are smaller than minFraction are replaced by a single otherLabel entry.
+        The "text" of wedges that aren't labelled, e.g. because they are smaller than minLabelFraction or the labels
+        were set to None, is None.
     fig : matplotlib figure object
         Figure containing the plot. Returned only if no input ax object is specified
     ax : matplotlib axes object
         Axis with the colored line. Returned only if no input ax object is specified
     """
-    # If colors is not specified, turn the style's colors into a list of hex colors
+    # If colors is not specified, use the style's colors
     if colors is None:
-        colors = [c for c in get_colors().values()]
-    # If colors is given as a qualitative matplotlib colormap, turn it into a list of hex colors
+        colors = list(get_colors().values())
+    # If colors is given as a qualitative matplotlib colormap, sample it at one color per category
     elif isinstance(colors, str):
-        colors = [mcolor.rgb2hex(plt.colormaps[colors](i)) for i in range(len(data))]
-    numColors = len(colors)
-
-    # Go through the colors and only take the color information (not transparency)
-    for i in range(len(colors)):
-        if colors[i][0] != "#":
-            raise ValueError("Colors specified as a string must start with a #")
-        colors[i] = colors[i][0:7]
-
-    # Sum categories and collapse subcategories
-    innerVals = []
-    innerLabels = []
-    outerVals = []
-    outerLabels = []
-    total = 0.0
-    maxSubcat = 0.0
-    for cat, val in data.items():  # top level categories
-        innerLabels.append(cat)
-        innerVals.append(0.0)
-
-        # Max number of subcategories for a given category
-        maxSubcat = max(maxSubcat, len(val))
-
-        for subcat, subcatVal in val.items():
-            innerVals[-1] += subcatVal
-            total += subcatVal
-
-            outerVals.append(subcatVal)
-            outerLabels.append(subcat)
+        colors = plt.colormaps[colors](np.arange(len(data)))
+    # Only take the color information (not transparency), this is a copy so the input colors aren't modified
+    baseColors = mcolor.to_rgba_array(colors)[:, :3]
+    numColors = len(baseColors)
+
+    rings = _get_nested_pie_rings(data, minFraction=minFraction, otherLabel=otherLabel)
+    numRings = len(rings)
+    total = rings[0]["values"].sum()
 
     # Define alphas if not specified
     if alphas is None:
-        alphas = np.linspace(0.75, 0.95, maxSubcat)[-1::-1]
-
-    innerColors = [colors[i % numColors] for i in range(len(data))]
-    outerColors = []
-    iCat = 0
-    for catVals in data.values():
-        numSubcats = len(catVals)
-        for iSubcat in range(numSubcats):
-            outerColors.append(colors[iCat % numColors] + float.hex(alphas[iSubcat])[4:6])
-        iCat += 1
-
-    # Nested plot fitting params
-    size = 0.3
+        maxSubcat = max([np.bincount(ring["parent"]).max() for ring in rings[1:]], default=1)
+        alphas = np.linspace(0.5, 0.9, maxSubcat)[-1::-1]
+    alphas = np.asarray(alphas, dtype=float)
+
+    # The inner wedges take the category colors and every wedge outside them takes the color of its top level category
+    # with a transparency that varies between subcategories, placeholder wedges are fully transparent
+    for i, ring in enumerate(rings):
+        ringColors = np.empty((len(ring["values"]), 4))
+        ringColors[:, :3] = baseColors[ring["category"] % numColors]
+        ringColors[:, 3] = 1.0 if i == 0 else alphas[ring["sibling"]]
+        ringColors[ring["placeholder"], 3] = 0.0
+        ring["colors"] = ringColors
+
+    # Nested plot fitting params, rings are squeezed to fit if there are more than the default size allows
     buffer = 0.01
+    size = min(0.3, (1.0 - buffer * (numRings - 1)) / numRings)
 
     # Create figure if it's not passed in
     returnFig = False
@@ -935,57 +2570,46 @@ def plot_nested_pie(
         fig, ax = plt.subplots()
         returnFig = True
 
-    # Set keyword arguments
-    outerKwargDefaults = {
-        "radius": 1.0,
-        "colors": outerColors,
-        "wedgeprops": dict(width=size, edgecolor=None),
-        "textprops": dict(rotation_mode="anchor", va="center", ha="center", color="w"),
-        "labels": outerLabels,
-        "rotatelabels": False,
-        "labeldistance": 0.85,
-    }
-    innerKwargDefaults = {
-        "radius": 1.0 - size - buffer,
-        "colors": innerColors,
-        "wedgeprops": dict(width=size, edgecolor=None),
-        "textprops": dict(rotation_mode="anchor", va="center", ha="center", color="w"),
-        "labels": innerLabels,
-        "rotatelabels": False,
-        "labeldistance": 0.75,
-    }
     outerKwargs = {} if outerKwargs is None else outerKwargs
     innerKwargs = {} if innerKwargs is None else innerKwargs
 
-    # Update kwargs
-    for outerKey, outerKwargVal in outerKwargDefaults.items():
-        if outerKey not in outerKwargs:
-            outerKwargs[outerKey] = outerKwargVal
-    for innerKey, innerKwargVal in innerKwargDefaults.items():
-        if innerKey not in innerKwargs:
-            innerKwargs[innerKey] = innerKwargVal
-
-    # Create the pie charts
-    outerWedges, outerText = ax.pie(outerVals, **outerKwargs)
-    innerWedges, innerText = ax.pie(innerVals, **innerKwargs)
-
-    ax.set(aspect="equal")
-
-    # Compile the wedge and text objects into the output dictionary
+    # Create the pie charts from the inside out
     pieObjects = {}
-    iSubcat = 0
-    for i, cat in enumerate(data.keys()):
-        pieObjects[cat] = {
-            "wedge": innerWedges[i],
-            "text": innerText[i],
+    ringObjects = [{}]
+    for i, ring in enumerate(rings):
+        radius = 1.0 - (numRings - 1 - i) * (size + buffer)
+        kwargDefaults = {
+            "radius": radius,
+            "colors": ring["colors"],
+            "wedgeprops": dict(width=size, edgecolor=None),
+            "textprops": dict(rotation_mode="anchor", va="center", ha="center", color="w"),
+            "labels": ring["labels"],
+            "rotatelabels": False,
+            "labeldistance": 0.75 if i == 0 else 1.0 - 0.5 * size / radius,
         }
+        kwargs = {**kwargDefaults, **(innerKwargs if i == 0 else outerKwargs)}
+
+        # The labels are added separately so no text objects are created for the wedges too small to label
+        labelDistance = kwargs.pop("labeldistance")
+        rotateLabels = kwargs.pop("rotatelabels")
+        textProps = kwargs.pop("textprops")
+        wedges = ax.pie(ring["values"], labeldistance=None, **kwargs)[0]
+        showLabel = ~ring["placeholder"] & (ring["values"] >= minLabelFraction * total)
+        texts = _add_pie_labels(ax, wedges, kwargs["labels"], showLabel, labelDistance, rotateLabels, textProps)
+
+        # Compile the wedge and text objects into the output dictionary, nested under their parent's entry
+        nodeObjects = []
+        for j, label in enumerate(ring["labels"]):
+            if ring["placeholder"][j]:
+                wedges[j].set_visible(False)
+                nodeObjects.append(None)
+                continue
+            nodeObjects.append({"wedge": wedges[j], "text": texts[j]})
+            parentObjects = pieObjects if i == 0 else ringObjects[ring["parent"][j]]
+            parentObjects[label] = nodeObjects[-1]
+        ringObjects = nodeObjects
 
-        for subcat in data[cat].keys():
-            pieObjects[cat][subcat] = {
-                "wedge": outerWedges[iSubcat],
-                "text": outerText[iSubcat],
-            }
-            iSubcat += 1
+    ax.set(aspect="equal")
 
     if returnFig:
         return pieObjects, fig, ax
@@ -993,6 +2617,209 @@ def plot_nested_pie(
         return pieObjects
 
 
+def _get_nested_pie_rings(data, minFraction=0.0, otherLabel="Other"):
+    """Flatten the nested data dict for a nested pie chart into the values of the wedges in each ring.
+
+    The leaves are gathered in a single depth-first pass, after which the wedge values in each ring are summed over the
+    leaves beneath them with numpy. Leaves that are shallower than the deepest part of the hierarchy are continued
+    outward by placeholder wedges so the wedges in every ring line up with their parents.
+
+    Parameters
+    ----------
+    data : nested dict
+        Data to plot, see plot_nested_pie
+    minFraction : float, optional
+        Leaves smaller than this fraction of the total are combined into one leaf per parent, by default 0.0
+    otherLabel : str, optional
+        Key of the combined leaves, by default "Other"
+
+    Returns
+    -------
+    list of dict
+        Wedges in each ring from the inside out, with "values", "labels", the "parent" index of each wedge in the
+        previous ring, the "category" index of the top level category it belongs to, its "sibling" index amongst the
+        wedges with the same parent, and whether it is a "placeholder"
+    """
+    paths = []
+    leafVals = []
+    stack = [((), data)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, Mapping) and len(node) > 0:
+            stack.extend(((*path, key), val) for key, val in reversed(node.items()))
+        else:
+            # Empty categories are kept as zero valued leaves so they still appear in the output
+            paths.append(path)
+            leafVals.append(0.0 if isinstance(node, Mapping) else node)
+
+    leafVals = np.asarray(leafVals, dtype=float)
+    if minFraction > 0.0:
+        paths, leafVals = _combine_small_pie_leaves(paths, leafVals, minFraction * leafVals.sum(), otherLabel)
+    pathLengths = np.array([len(path) for path in paths])
+    numLeaves = len(paths)
+
+    rings = []
+    leafNodes = np.zeros(numLeaves, dtype=int)
+    for level in range(pathLengths.max()):
+        # Consecutive leaves that share the same key path up to this level belong to the same wedge
+        keys = [path[: level + 1] for path in paths]
+        newNode = np.array([True] + [keys[i] != keys[i - 1] for i in range(1, numLeaves)])
+        parentLeafNodes = leafNodes
+        leafNodes = np.cumsum(newNode) - 1
+        if level == 0:
+            categoryLeafNodes = leafNodes
+        firstLeaves = np.flatnonzero(newNode)
+        numNodes = len(firstLeaves)
+
+        parent = parentLeafNodes[firstLeaves]
+        groupStarts = np.flatnonzero(np.concatenate(([True], parent[1:] != parent[:-1])))
+        sibling = np.arange(numNodes) - np.repeat(groupStarts, np.diff(np.append(groupStarts, numNodes)))
+        placeholder = pathLengths[firstLeaves] <= level
+
+        rings.append(
+            {
+                "values": np.bincount(leafNodes, weights=leafVals, minlength=numNodes),
+                "labels": ["" if p else keys[i][-1] for i, p in zip(firstLeaves, placeholder)],
+                "parent": parent,
+                "category": categoryLeafNodes[firstLeaves],
+                "sibling": sibling,
+                "placeholder": placeholder,
+            }
+        )
+
+    return rings
+
+
+def _combine_small_pie_leaves(paths, leafVals, minVal, otherLabel):
+    """Combine the leaves of a nested pie chart that are smaller than a minimum value into a single leaf per parent.
+
+    The combined leaf is placed after the last leaf of its parent so the leaves stay in depth-first order. If the
+    parent already has a leaf with the ``otherLabel`` key that isn't being combined, the small leaves are added to it
+    instead, so there is only ever one wedge with that key.
+
+    Parameters
+    ----------
+    paths : list of tuple
+        Key path of each leaf, in depth-first order
+    leafVals : numpy array
+        Value of each leaf
+    minVal : float
+        Leaves with a value below this are combined, unless they are the only small leaf of their parent
+    otherLabel : str
+        Key of the combined leaves
+
+    Returns
+    -------
+    list of tuple
+        Key path of each leaf after combining
+    numpy array
+        Value of each leaf after combining
+    """
+    parents = [path[:-1] for path in paths]
+    small = leafVals < minVal
+
+    # Only combine the small leaves of parents that have more than one of them
+    numSmall = Counter(parent for parent, isSmall in zip(parents, small) if isSmall)
+    combine = np.array([isSmall and numSmall[parent] > 1 for parent, isSmall in zip(parents, small)], dtype=bool)
+    if not np.any(combine):
+        return paths, leafVals
+
+    otherVals = {}
+    for i in np.flatnonzero(combine):
+        otherVals[parents[i]] = otherVals.get(parents[i], 0.0) + leafVals[i]
+
+    # Leaves that already have the otherLabel key take the combined values, but a dict with that key can't
+    otherPaths = {(*parent, otherLabel) for parent in otherVals}
+    existingOther = {}
+    for i, path in enumerate(paths):
+        if path in otherPaths and not combine[i]:
+            existingOther[i] = parents[i]
+        for depth in range(1, len(path)):
+            if path[:depth] in otherPaths:
+                raise ValueError(
+                    f"Can't combine the small subcategories of {list(path[: depth - 1])} into {otherLabel!r}, as "
+                    "they already include a dict with that key, use a different otherLabel"
+                )
+
+    # The combined leaf goes after the last leaf beneath its parent, deeper parents finish first
+    lastLeaf = {}
+    for i, path in enumerate(paths):
+        for depth in range(len(path)):
+            lastLeaf[path[:depth]] = i
+    otherAfter = {}
+    for parent in sorted(otherVals, key=len, reverse=True):
+        if parent not in existingOther.values():
+            otherAfter.setdefault(lastLeaf[parent], []).append(parent)
+
+    newPaths = []
+    newVals = []
+    for i, path in enumerate(paths):
+        if not combine[i]:
+            newPaths.append(path)
+            newVals.append(leafVals[i] + (otherVals[existingOther[i]] if i in existingOther else 0.0))
+        for parent in otherAfter.get(i, []):
+            newPaths.append((*parent, otherLabel))
+            newVals.append(otherVals[parent])
+
+    return newPaths, np.array(newVals)
+
+
+def _add_pie_labels(ax, wedges, labels, showLabel, labelDistance, rotateLabels=False, textProps=None):
+    """Label the wedges of a pie chart the same way matplotlib.pyplot.pie does, but only the ones that are shown.
+
+    Parameters
+    ----------
+    ax : matplotlib axes object
+        Axes the pie chart is on
+    wedges : list of matplotlib.patches.Wedge
+        Wedges of the pie chart
+    labels : list of str or None
+        Label of each wedge, no labels are added if None
+    showLabel : numpy array of bool
+        Whether to label each wedge
+    labelDistance : float or None
+        Radial distance of the labels as a fraction of the pie radius, no labels are added if None
+    rotateLabels : bool, optional
+        Whether to rotate each label to the angle of its wedge, by default False
+    textProps : dict, optional
+        Properties to set on the text objects, by default None
+
+    Returns
+    -------
+    list of matplotlib Text objects
+        Text object for each wedge, None for the wedges that aren't labelled
+    """
+    texts = [None] * len(wedges)
+    if labels is None or labelDistance is None:
+        return texts
+    textProps = {} if textProps is None else textProps
+
+    for i in np.flatnonzero(showLabel):
+        wedge = wedges[i]
+        thetaMid = np.deg2rad(0.5 * (wedge.theta1 + wedge.theta2))
+        xText = wedge.center[0] + labelDistance * wedge.r * np.cos(thetaMid)
+        yText = wedge.center[1] + labelDistance * wedge.r * np.sin(thetaMid)
+        alignH = "left" if xText > 0 else "right"
+        alignV = "center"
+        rotation = "horizontal"
+        if rotateLabels:
+            alignV = "bottom" if yText > 0 else "top"
+            rotation = np.rad2deg(thetaMid) + (0 if xText > 0 else 180)
+        texts[i] = ax.text(
+            xText,
+            yText,
+            labels[i],
+            clip_on=False,
+            horizontalalignment=alignH,
+            verticalalignment=alignV,
+            rotation=rotation,
+            size=plt.rcParams["xtick.labelsize"],
+        )
+        texts[i].set(**textProps)
+
+    return texts
+
+
 def plot_spline(x, y, ax=None, spline_type="non-overshoot", num_interp_pts=100, spline_options={}, **plot_kwargs):
     """
     Fits a spline to the data points and plots the spline.
@@ -1030,6 +2857,9 @@ def plot_spline(x, y, ax=None, spline_type="non-overshoot", num_interp_pts=100,
     fig, ax
         If ax is not provided, generates and returns new matplotlib figure and axis
     """
+    # scipy is slow to import and only needed here, so don't make everyone who imports niceplots pay for it
+    from scipy.interpolate import make_interp_spline, Akima1DInterpolator
+
     return_fig = False
     if ax is None:
         fig, ax = plt.subplots()
@@ -1058,9 +2888,20 @@ def plot_spline(x, y, ax=None, spline_type="non-overshoot", num_interp_pts=100,
         return fig, ax
 
 
-def save_figs(fig, name, formats, format_kwargs=None, **kwargs):
+def save_figs(
+    fig, name, formats, format_kwargs=None, parallel=False, max_workers=None, inputs=None, force=False, **kwargs
+):
     """Save a figure in multiple formats
 
+    The files are first written to a temporary directory next to the final ones, and only replace the final files once
+    every format has been saved successfully, so a failure part way through never leaves a mix of old and new files.
+    Any extra files written alongside a format, e.g. the images that pgf files include, are moved with it.
+
+    If the inputs the figure was made from are given, their hash (see :func:`get_plot_hash`) is stored alongside the
+    files, and the next time the figure is saved with the same inputs, any existing files whose stored hash matches
+    are kept instead of being rendered again. Saving a file without inputs forgets its stored hash, as the file may
+    no longer match it.
+
     Parameters
     ----------
     fig : Matplotlib figure
@@ -1072,26 +2913,431 @@ def save_figs(fig, name, formats, format_kwargs=None, **kwargs):
     format_kwargs : dict, optional
         A dictionary of dictionaries, where the keys are the file formats and the values are any keyword arguments that
         should only be applied to that format. These kwargs will be added to ones passed to all formats, by default None
+    parallel : bool, optional
+        Whether to render the formats concurrently, by default False. Each format is rendered in a separate process
+        from a pickled copy of the figure, using the current rcParams, so the figure must be picklable.
+        Matplotlib figures can't safely be drawn from multiple threads, so there is no thread-based option.
+    max_workers : int, optional
+        Maximum number of processes to use when rendering in parallel, by default one per format
+    inputs : any, optional
+        Data, options and anything else that determines what the figure looks like, e.g. the arguments passed to the
+        function that created it, by default None, in which case every format is always saved
+    force : bool, optional
+        Save every format even if the existing files were made from the same inputs, by default False
     kwargs :
         Any keyword arguments to pass to `plt.savefig()` for all formats
+
+    Returns
+    -------
+    dict
+        Time taken to render and write each format, in seconds, keyed by file format. Formats whose existing file was
+        kept have a time of zero.
     """
 
     # --- Strip any extension from the name ---
     fileName = os.path.splitext(name)[0]
 
-    # --- Convert the file format to a list if only one given ---
+    # --- Work out the hash of each format's output if the inputs were given ---
+    formatHashes = _get_format_hashes(formats, format_kwargs, kwargs, inputs)
+    storedHashes = _read_output_hashes(fileName) if inputs is not None and not force else {}
+
+    # --- Work out where to temporarily save each format and the kwargs to save it with ---
+    # The temporary files keep the final file name, as some backends (e.g. pgf) name the extra files they write after it
+    fileDir, baseName = os.path.split(fileName)
+    tmpDir = _get_temp_file_path(fileName, "tmp")
+    saveJobs = OrderedDict()
+    for ext in _get_extensions(formats):
+        if ext in storedHashes and storedHashes[ext] == formatHashes[ext] and os.path.exists(fileName + "." + ext):
+            continue
+        saveJobs[ext] = (os.path.join(tmpDir, f"{baseName}.{ext}"), _get_save_kwargs(ext, format_kwargs, kwargs))
+
+    # --- Save the figures ---
+    timings = OrderedDict((ext, 0.0) for ext in _get_extensions(formats))
+    if len(saveJobs) > 0:
+        os.mkdir(tmpDir)
+    try:
+        if len(saveJobs) == 0:
+            pass
+        elif parallel:
+            figData = pickle.dumps(fig)
+            rc = _get_worker_rc()
+            with ProcessPoolExecutor(max_workers=max_workers or len(saveJobs)) as executor:
+                futures = OrderedDict(
+                    (ext, executor.submit(_save_pickled_fig, figData, tmpPath, ext_kwargs, rc))
+                    for ext, (tmpPath, ext_kwargs) in saveJobs.items()
+                )
+                for ext, future in futures.items():
+                    timings[ext] = future.result()
+        else:
+            for ext, (tmpPath, ext_kwargs) in saveJobs.items():
+                timings[ext] = _save_fig_file(fig, tmpPath, ext_kwargs)
+    except BaseException:
+        shutil.rmtree(tmpDir, ignore_errors=True)
+        raise
+
+    # --- Everything saved successfully, so move the files into place ---
+    if len(saveJobs) > 0:
+        for tmpName in os.listdir(tmpDir):
+            os.replace(os.path.join(tmpDir, tmpName), os.path.join(fileDir, tmpName))
+        os.rmdir(tmpDir)
+
+    # --- Record the hashes of the new files, forgetting the stored hash of any file saved without inputs ---
+    if len(saveJobs) > 0:
+        storedHashes = _read_output_hashes(fileName)
+        newHashes = {ext: h for ext, h in storedHashes.items() if ext not in saveJobs}
+        newHashes.update(formatHashes)
+        if newHashes != storedHashes:
+            _write_output_hashes(fileName, newHashes)
+
+    return timings
+
+
+def get_plot_hash(*inputs):
+    """Compute a hash of the inputs to a plot, used by :func:`save_figs` to work out whether a figure's existing files
+    are up to date.
+
+    Numpy arrays are hashed by their contents, containers by their items, and functions by their name, code, default
+    arguments, closure, and the global variables they use. Any other object is hashed by its ``repr``, so objects whose
+    ``repr`` changes between runs (e.g. includes a memory address) will never match a stored hash, which errs on the
+    side of saving the figure again. The same goes for callables that can't be identified by their code alone, such
+    as bound methods, partials, and callable objects, whose behaviour depends on state that can't be hashed reliably.
+    The current rcParams and the niceplots and matplotlib versions are always included, so changing style also changes
+    the hash.
+
+    Parameters
+    ----------
+    inputs :
+        Any number of objects that determine what the plot looks like
+
+    Returns
+    -------
+    str
+        Hex digest of the hash
+    """
+    hasher = hashlib.sha256()
+    try:
+        _update_hash(hasher, [__version__, matplotlib.__version__, _get_worker_rc(), inputs])
+    except _UnstableHashError:
+        return uuid.uuid4().hex
+    return hasher.hexdigest()
+
+
+class _UnstableHashError(Exception):
+    """Raised when an object can't be hashed in a way that identifies it, so the hash can't be trusted to match only
+    when the object does."""
+
+
+def _update_hash(hasher, obj, seen=None):
+    """Recursively add an object to a hash. ``seen`` holds the ids of the functions already added, so recursive
+    functions don't recurse forever."""
+    seen = set() if seen is None else seen
+    if isinstance(obj, np.ndarray) and obj.dtype != object:
+        hasher.update(f"ndarray{obj.dtype.str}{obj.shape}".encode())
+        hasher.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, dict) or (hasattr(obj, "keys") and hasattr(obj, "items")):
+        hasher.update(f"dict{len(obj)}".encode())
+        for key, val in obj.items():
+            _update_hash(hasher, key, seen)
+            _update_hash(hasher, val, seen)
+    elif isinstance(obj, (list, tuple, np.ndarray)):
+        hasher.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for val in obj:
+            _update_hash(hasher, val, seen)
+    elif isinstance(obj, (str, bytes)):
+        hasher.update(type(obj).__name__.encode())
+        hasher.update(obj.encode() if isinstance(obj, str) else obj)
+    elif isinstance(obj, FunctionType):
+        hasher.update(f"function{obj.__module__}.{obj.__qualname__}".encode())
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        _update_code_hash(hasher, obj.__code__)
+        # Functions built by the same code can still behave differently through their defaults, closures, and the
+        # global variables they use, e.g. other functions they call
+        _update_hash(hasher, [obj.__defaults__, obj.__kwdefaults__], seen)
+        _update_hash(hasher, [_get_cell_contents(cell) for cell in obj.__closure__ or []], seen)
+        globalNames = sorted(name for name in _get_code_names(obj.__code__) if name in obj.__globals__)
+        _update_hash(hasher, {name: obj.__globals__[name] for name in globalNames}, seen)
+    elif callable(obj) and not _has_identifying_repr(obj):
+        raise _UnstableHashError(f"{obj!r} can't be identified by its code alone")
+    else:
+        hasher.update(f"{type(obj).__name__}{obj!r}".encode())
+
+
+def _update_code_hash(hasher, code):
+    """Add a code object to a hash, along with the code objects nested in it, e.g. of lambdas defined inside it."""
+    hasher.update(code.co_code)
+    _update_hash(hasher, [code.co_names, code.co_varnames])
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_code_hash(hasher, const)
+        else:
+            _update_hash(hasher, const)
+
+
+def _get_code_names(code):
+    """Get the names used by a code object and the code objects nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _get_code_names(const)
+    return names
+
+
+def _get_cell_contents(cell):
+    """Get the contents of a closure cell, which is None if it hasn't been assigned yet."""
+    try:
+        return cell.cell_contents
+    except ValueError:
+        return None
+
+
+def _has_identifying_repr(obj):
+    """Check whether a callable that isn't a plain function is identified by its ``repr``. Bound methods, partials, and
+    callable objects with the default ``repr`` can behave differently despite having the same ``repr``, as they depend
+    on the state of the objects they hold."""
+    if isinstance(obj, (MethodType, functools.partial)):
+        return False
+    if isinstance(obj, BuiltinFunctionType):
+        return obj.__self__ is None or isinstance(obj.__self__, ModuleType)
+    return type(obj).__repr__ is not object.__repr__
+
+
+def _get_extensions(formats):
+    """Get a list of file extensions, without the leading dot, from the formats passed to save_figs."""
     if isinstance(formats, str):
         formats = [formats]
+    return [ext[1:] if ext[0] == "." else ext for ext in formats]
 
-    # --- Save the figures ---
-    for ext in formats:
-        if ext[0] == ".":
-            ext = ext[1:]
-        # Add any format-specific kwargs
-        ext_kwargs = copy.deepcopy(kwargs)
-        if format_kwargs is not None and ext in format_kwargs:
-            ext_kwargs.update(format_kwargs[ext])
-        fig.savefig(fileName + "." + ext, **ext_kwargs)
+
+def _get_save_kwargs(ext, format_kwargs, kwargs):
+    """Combine the savefig kwargs for all formats with the ones for a specific format."""
+    ext_kwargs = copy.deepcopy(kwargs)
+    if format_kwargs is not None and ext in format_kwargs:
+        ext_kwargs.update(format_kwargs[ext])
+    return ext_kwargs
+
+
+def _get_format_hashes(formats, format_kwargs, kwargs, inputs):
+    """Get the hash of each format's output, which depends on the plot inputs and the kwargs it is saved with."""
+    if inputs is None:
+        return {}
+    inputsHash = get_plot_hash(inputs)
+    return {
+        ext: get_plot_hash(inputsHash, ext, _get_save_kwargs(ext, format_kwargs, kwargs))
+        for ext in _get_extensions(formats)
+    }
+
+
+def _get_hash_file_path(fileName):
+    """Get the path of the hidden file storing the hashes of the files saved under ``fileName``."""
+    fileDir, baseName = os.path.split(fileName)
+    return os.path.join(fileDir, f".{baseName}.niceplots-hash.json")
+
+
+def _read_output_hashes(fileName):
+    """Read the stored hashes of the files saved under ``fileName``, keyed by file extension."""
+    try:
+        with open(_get_hash_file_path(fileName)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_output_hashes(fileName, hashes):
+    """Store the hashes of the files saved under ``fileName``."""
+    hashFilePath = _get_hash_file_path(fileName)
+    tmpPath = _get_temp_file_path(fileName, "json")
+    with open(tmpPath, "w") as f:
+        json.dump(hashes, f)
+    os.replace(tmpPath, hashFilePath)
+
+
+def _outputs_up_to_date(name, formats, format_kwargs, kwargs, inputs):
+    """Check whether every format of a figure has already been saved from the same inputs."""
+    fileName = os.path.splitext(name)[0]
+    storedHashes = _read_output_hashes(fileName)
+    formatHashes = _get_format_hashes(formats, format_kwargs, kwargs, inputs)
+    return all(
+        storedHashes.get(ext) == formatHash and os.path.exists(fileName + "." + ext)
+        for ext, formatHash in formatHashes.items()
+    )
+
+
+def _get_temp_file_path(fileName, ext):
+    """Get a unique temporary file path in the same directory as ``fileName`` with the extension ``ext``, so that
+    matplotlib still infers the right format from it."""
+    fileDir, baseName = os.path.split(fileName)
+    return os.path.join(fileDir, f".{baseName}-{uuid.uuid4().hex[:12]}.{ext}")
+
+
+def _save_fig_file(fig, filePath, kwargs):
+    """Save a figure to a single file and return how long it took."""
+    startTime = time.perf_counter()
+    fig.savefig(filePath, **kwargs)
+    return time.perf_counter() - startTime
+
+
+def _save_pickled_fig(figData, filePath, kwargs, rc):
+    """Unpickle a figure and save it to a single file, this is what runs in the worker processes of save_figs."""
+    _setup_worker()
+    with matplotlib.rc_context(rc):
+        fig = pickle.loads(figData)
+        elapsed = _save_fig_file(fig, filePath, kwargs)
+    plt.close(fig)
+    return elapsed
+
+
+def _setup_worker():
+    """Prepare a worker process for rendering figures."""
+    # Workers can't open windows and, depending on how they were started, may not have the parent's fonts or rcParams
+    plt.switch_backend("agg")
+    addFonts()
+
+
+def _get_worker_rc():
+    """Get the current rcParams in a form that can be sent to a worker process and applied there."""
+    return {key: plt.rcParams[key] for key in plt.rcParams if key != "backend"}
+
+
+def save_figs_batch(
+    figs,
+    formats,
+    format_kwargs=None,
+    parallel=False,
+    max_workers=None,
+    close_figs=True,
+    inputs=None,
+    force=False,
+    **kwargs,
+):
+    """Save many figures, each in multiple formats, using :func:`save_figs`
+
+    Usage example::
+
+        import niceplots
+
+        def make_fig():
+            fig, ax = plt.subplots()
+            ax.plot([0, 1], [0, 1])
+            return fig
+
+        manifest = niceplots.save_figs_batch(
+            {"plots/line": make_fig, "plots/existing": existingFig}, ["png", "pdf"], parallel=True
+        )
+
+    Parameters
+    ----------
+    figs : dict
+        Maps the output path of each figure, as passed to :func:`save_figs`, to either a Matplotlib figure or a
+        function that takes no arguments and returns one. Functions are called just before their figure is saved (in
+        the worker process when saving in parallel, in which case they must be picklable, e.g. defined at the top level
+        of a module), so figures created this way never all exist at once.
+    formats : str, list[str]
+        file formats to save the figures in, e.g. "png", "pdf", "svg"
+    format_kwargs : dict, optional
+        Format-specific keyword arguments, see :func:`save_figs`, by default None
+    parallel : bool, optional
+        Whether to render the figures concurrently in a pool of processes, by default False. Figures, rather than
+        functions creating figures, are pickled to send them to the workers, so must be picklable. The workers use the
+        current rcParams.
+    max_workers : int, optional
+        Maximum number of processes to use when rendering in parallel, by default the number of CPUs
+    close_figs : bool, optional
+        Whether to close each figure as soon as it has been saved (or sent to a worker process) to free its memory, by
+        default True
+    inputs : dict, optional
+        The inputs each figure is made from, keyed by output path like ``figs``, see :func:`save_figs`. Figures whose
+        files were all saved from the same inputs before are skipped, and if they are given as functions, the
+        functions aren't even called. By default None, in which case every figure is saved.
+    force : bool, optional
+        Save every figure even if its existing files were made from the same inputs, by default False
+    kwargs :
+        Any keyword arguments to pass to `plt.savefig()` for all figures and formats
+
+    Returns
+    -------
+    dict
+        Manifest of the saved figures, keyed by output path like ``figs``. Each entry is a dictionary containing the
+        paths of the saved files under "files", the time taken to save each format under "timings", and the time taken
+        to create the figure, zero for figures that were passed in directly or skipped, under "createTime".
+    """
+    manifest = OrderedDict()
+    inputs = {} if inputs is None else inputs
+
+    if not parallel:
+        for name, fig in figs.items():
+            manifest[name] = _save_figs_job(
+                fig, name, formats, format_kwargs, kwargs, close_figs, inputs.get(name), force
+            )
+        return manifest
+
+    rc = _get_worker_rc()
+    numWorkers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+        # Only keep a couple of figures per worker in flight so pickled figures don't pile up in memory
+        maxPending = 2 * numWorkers
+        pending = {}
+        for name, fig in figs.items():
+            if len(pending) >= maxPending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    manifest[pending.pop(future)] = future.result()
+
+            # Don't bother sending figures that are already up to date to the workers
+            figInputs = inputs.get(name)
+            if not force and figInputs is not None:
+                if _outputs_up_to_date(name, formats, format_kwargs, kwargs, figInputs):
+                    manifest[name] = _save_figs_job(fig, name, formats, format_kwargs, kwargs, close_figs, figInputs)
+                    continue
+
+            if callable(fig):
+                figSource = fig
+            else:
+                figSource = pickle.dumps(fig)
+                if close_figs:
+                    plt.close(fig)
+            future = executor.submit(
+                _save_figs_worker_job, figSource, name, formats, format_kwargs, kwargs, rc, figInputs, force
+            )
+            pending[future] = name
+
+        for future in pending:
+            manifest[pending[future]] = future.result()
+
+    # Put the manifest in the same order as the input figures
+    return OrderedDict((name, manifest[name]) for name in figs)
+
+
+def _save_figs_job(fig, name, formats, format_kwargs, kwargs, closeFig, inputs=None, force=False):
+    """Create a figure if needed, save it in all the formats, and return its manifest entry."""
+    fileName = os.path.splitext(name)[0]
+    createTime = 0.0
+
+    if not force and inputs is not None and _outputs_up_to_date(name, formats, format_kwargs, kwargs, inputs):
+        timings = OrderedDict((ext, 0.0) for ext in _get_extensions(formats))
+        if closeFig and not callable(fig):
+            plt.close(fig)
+    else:
+        if callable(fig):
+            startTime = time.perf_counter()
+            fig = fig()
+            createTime = time.perf_counter() - startTime
+
+        timings = save_figs(fig, name, formats, format_kwargs=format_kwargs, inputs=inputs, force=force, **kwargs)
+        if closeFig:
+            plt.close(fig)
+
+    return {"files": [fileName + "." + ext for ext in timings], "timings": timings, "createTime": createTime}
+
+
+def _save_figs_worker_job(figSource, name, formats, format_kwargs, kwargs, rc, inputs=None, force=False):
+    """Save a pickled figure, or one created by a function, in all the formats, this is what runs in the worker
+    processes of save_figs_batch."""
+    _setup_worker()
+    with matplotlib.rc_context(rc):
+        fig = figSource if callable(figSource) else pickle.loads(figSource)
+        return _save_figs_job(fig, name, formats, format_kwargs, kwargs, True, inputs, force)
 
 
 def All():
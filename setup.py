@@ -30,4 +30,5 @@ setup(
     ],
     include_package_data=True,
     package_data={"": ["styles/*.mplstyle", "fonts/*.ttf"]},
+    entry_points={"console_scripts": ["niceplots-font-cache=niceplots.font_utils:main"]},
 )